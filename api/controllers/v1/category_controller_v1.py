@@ -1,7 +1,13 @@
-from fastapi import APIRouter, status, Depends, Request
-from fastapi_pagination import Page, paginate
-
-from api.dtos.responses.category_response_dto import CategoryResponseDTO
+from fastapi import APIRouter, status, Depends, Request, Response, Query
+from fastapi_pagination import Page, Params, create_page
+
+from api.dtos.requests.batch_request_dto import BatchRequestDTO
+from api.dtos.requests.list_request_dto import ListFilterRequestDTO
+from api.dtos.responses.category_response_dto import (
+    CategoryResponseDTO,
+    CategoryBatchResponseDTO
+)
+from api.dtos.responses.cursor_page_response_dto import CursorPageResponseDTO
 from api.dtos.responses.exception_response_dto import (
     ExceptionResponseDTO,
     ExceptionRateLimitResponseDTO
@@ -13,14 +19,14 @@ from api.dtos.requests.category_request_dto import (
 from api.services.category_service import CategoryService
 from api.dtos.responses.user_response_dto import UserResponseDTO
 
-from typing import List
-
 from slowapi import Limiter
 from slowapi.util import get_remote_address 
 
 from core.current_user import CurrentUser
 from core.config import settings
 
+from utils.http_cache import http_cache
+
 
 category_router_v1 = APIRouter()
 category_service = CategoryService()
@@ -60,10 +66,63 @@ async def store(
     }
 )
 async def index(
+    params: Params = Depends(),
+    filters: ListFilterRequestDTO = Query(),
     user_logged: UserResponseDTO = Depends(current_user.get_current_user)
 ) -> Page[CategoryResponseDTO]:
-    categories: List[CategoryResponseDTO] = await category_service.index_service(user_logged.id)
-    return paginate(categories)
+    categories, total = await category_service.index_service(
+        user_logged.id,
+        params.page,
+        params.size,
+        filters
+    )
+    return create_page(categories, total=total, params=params)
+
+
+@category_router_v1.post(
+    "/batch",
+    summary="Informações de várias categorias por ID",
+    description="Retorna as categorias encontradas na ordem solicitada e os IDs não encontrados",
+    status_code=status.HTTP_200_OK,
+    response_model=CategoryBatchResponseDTO,
+    responses={
+        401: {"model": ExceptionResponseDTO}
+    }
+)
+async def show_many(
+    batchRequestDTO: BatchRequestDTO,
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+) -> CategoryBatchResponseDTO:
+    categories, missing = await category_service.show_many_service(batchRequestDTO.ids)
+    return CategoryBatchResponseDTO(items=categories, missing=missing)
+
+
+@category_router_v1.get(
+    "/cursor",
+    summary="Lista de categorias por usuário e cursor",
+    description="Retorna uma lista de categorias por usuário paginada por cursor",
+    status_code=status.HTTP_200_OK,
+    response_model=CursorPageResponseDTO[CategoryResponseDTO],
+    responses={
+        400: {"model": ExceptionResponseDTO},
+        401: {"model": ExceptionResponseDTO}
+    }
+)
+async def index_cursor(
+    cursor: str | None = None,
+    size: int = Query(50, ge=1, le=100),
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+) -> CursorPageResponseDTO[CategoryResponseDTO]:
+    categories, next_cursor = await category_service.index_cursor_service(
+        user_logged.id,
+        cursor,
+        size
+    )
+    return CursorPageResponseDTO[CategoryResponseDTO](
+        items=categories,
+        size=size,
+        next_cursor=next_cursor
+    )
 
 
 @category_router_v1.get(
@@ -73,15 +132,31 @@ async def index(
     status_code=status.HTTP_200_OK,
     response_model=CategoryResponseDTO,
     responses={
+        304: {"description": "Categoria não modificada"},
         401: {"model": ExceptionResponseDTO},
         404: {"model": ExceptionResponseDTO}
     }
 )
 async def show(
+    request: Request,
+    response: Response,
     id: str,
     user_logged: UserResponseDTO = Depends(current_user.get_current_user)
 ) -> CategoryResponseDTO:
-    return await category_service.show_service(id)
+    stamp = http_cache.stamp(f"category:{id}")
+
+    if stamp != None and http_cache.is_not_modified(request, stamp):
+        return http_cache.not_modified_response(stamp)
+
+    category: CategoryResponseDTO = await category_service.show_service(id)
+    stamp = http_cache.remember(f"category:{id}", category.updated_at)
+
+    if http_cache.is_not_modified(request, stamp):
+        return http_cache.not_modified_response(stamp)
+
+    response.headers.update(http_cache.headers(stamp))
+
+    return category
 
 
 @category_router_v1.put(
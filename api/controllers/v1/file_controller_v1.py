@@ -0,0 +1,59 @@
+import os
+
+from fastapi import APIRouter, status
+from fastapi.responses import FileResponse
+
+from api.dtos.responses.exception_response_dto import ExceptionResponseDTO
+from api.exceptions.http_exception import Exception
+
+from typing import Literal
+
+from utils.signed_url import SignedUrl
+from utils.storage import Storage
+from utils.thumbnail import ImageSize
+
+
+file_router_v1 = APIRouter()
+exception = Exception()
+
+
+@file_router_v1.get(
+    "/{path}/{filename}",
+    summary="Arquivo enviado por URL assinada",
+    description="Retorna um arquivo imutável a partir de uma URL assinada e com validade",
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {
+            "content": {"image/png;image/jpg;image/jpeg": {}},
+            "description": "Retorna o arquivo solicitado",
+        },
+        403: {"model": ExceptionResponseDTO},
+        404: {"model": ExceptionResponseDTO}
+    }
+)
+async def show_file(
+    path: Literal["products", "users"],
+    filename: str,
+    expires: int,
+    signature: str,
+    size: ImageSize = ImageSize.original
+):
+    if not SignedUrl.verify(path, filename, expires, signature):
+        raise exception.exception_error(
+            "URL inválida ou expirada",
+            status.HTTP_403_FORBIDDEN
+        )
+
+    file_path: str = Storage.file_path(filename, path, size)
+
+    if not os.path.isfile(file_path):
+        raise exception.exception_error(
+            "Arquivo não encontrado",
+            status.HTTP_404_NOT_FOUND
+        )
+
+    return FileResponse(
+        path=file_path,
+        filename=filename,
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
@@ -0,0 +1,110 @@
+from fastapi import APIRouter, status, Depends
+
+from api.dtos.responses.metrics_response_dto import (
+    DatabaseMetricsResponseDTO,
+    CacheMetricsResponseDTO,
+    HashPoolMetricsResponseDTO,
+    SingleFlightMetricsResponseDTO,
+    PrefixIndexMetricsResponseDTO
+)
+from api.dtos.responses.exception_response_dto import ExceptionResponseDTO
+from api.dtos.responses.user_response_dto import UserResponseDTO
+from api.repositories.product_repository import product_cache, product_name_index
+from api.repositories.category_repository import category_cache
+
+from core.current_user import CurrentUser, user_cache, token_cache
+from core.database import database
+
+from typing import Dict
+
+from utils.hash import hash_pool
+from utils.single_flight import single_flight
+
+
+metrics_router_v1 = APIRouter()
+current_user = CurrentUser()
+
+
+@metrics_router_v1.get(
+    "/database",
+    summary="Métricas do pool de conexões do banco de dados",
+    description="Retorna a configuração e as estatísticas do pool de conexões",
+    status_code=status.HTTP_200_OK,
+    response_model=DatabaseMetricsResponseDTO,
+    responses={
+        401: {"model": ExceptionResponseDTO}
+    }
+)
+async def database_metrics(
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+) -> DatabaseMetricsResponseDTO:
+    return DatabaseMetricsResponseDTO(**await database.stats())
+
+
+@metrics_router_v1.get(
+    "/cache",
+    summary="Métricas dos caches em memória",
+    description="Retorna tamanho, acertos, falhas e remoções de cada cache",
+    status_code=status.HTTP_200_OK,
+    response_model=Dict[str, CacheMetricsResponseDTO],
+    responses={
+        401: {"model": ExceptionResponseDTO}
+    }
+)
+async def cache_metrics(
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+) -> Dict[str, CacheMetricsResponseDTO]:
+    return {
+        "users": CacheMetricsResponseDTO(**user_cache.stats()),
+        "tokens": CacheMetricsResponseDTO(**token_cache.stats()),
+        "products": CacheMetricsResponseDTO(**product_cache.stats()),
+        "categories": CacheMetricsResponseDTO(**category_cache.stats())
+    }
+
+
+@metrics_router_v1.get(
+    "/hash",
+    summary="Métricas do pool de hash de senhas",
+    description="Retorna a ocupação e a fila do pool de hash de senhas",
+    status_code=status.HTTP_200_OK,
+    response_model=HashPoolMetricsResponseDTO,
+    responses={
+        401: {"model": ExceptionResponseDTO}
+    }
+)
+async def hash_metrics(
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+) -> HashPoolMetricsResponseDTO:
+    return HashPoolMetricsResponseDTO(**hash_pool.stats())
+
+
+@metrics_router_v1.get(
+    "/single-flight",
+    summary="Métricas de coalescência de leituras",
+    description="Retorna as consultas executadas e compartilhadas entre requisições concorrentes",
+    status_code=status.HTTP_200_OK,
+    response_model=SingleFlightMetricsResponseDTO,
+    responses={
+        401: {"model": ExceptionResponseDTO}
+    }
+)
+async def single_flight_metrics(
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+) -> SingleFlightMetricsResponseDTO:
+    return SingleFlightMetricsResponseDTO(**single_flight.stats())
+
+
+@metrics_router_v1.get(
+    "/autocomplete",
+    summary="Métricas do índice de autocompletar produtos",
+    description="Retorna a quantidade de nomes, a memória ocupada e o tempo de construção do índice",
+    status_code=status.HTTP_200_OK,
+    response_model=PrefixIndexMetricsResponseDTO,
+    responses={
+        401: {"model": ExceptionResponseDTO}
+    }
+)
+async def autocomplete_metrics(
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+) -> PrefixIndexMetricsResponseDTO:
+    return PrefixIndexMetricsResponseDTO(**product_name_index.stats())
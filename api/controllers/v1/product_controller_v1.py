@@ -1,12 +1,24 @@
-from fastapi import APIRouter, status, UploadFile, Depends, Request
-from fastapi_pagination import Page, paginate
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, status, UploadFile, Depends, Request, Response, Query
+from fastapi_pagination import Page, Params, create_page
+from fastapi.responses import FileResponse, StreamingResponse, JSONResponse
 
 from api.dtos.requests.product_request_dto import (
     ProductCreateRequestDTO,
-    ProductUpdateRequestDTO
+    ProductUpdateRequestDTO,
+    ProductBulkCreateRequestDTO,
+    ProductBulkUpdateRequestDTO,
+    ProductListFilterRequestDTO,
+    ProductReadRequestDTO,
+    ProductFileFormat
 )
-from api.dtos.responses.product_response_dto import ProductResponseDTO
+from api.dtos.requests.batch_request_dto import BatchRequestDTO
+from api.dtos.responses.product_response_dto import (
+    ProductResponseDTO,
+    ProductBatchResponseDTO,
+    ProductImportResponseDTO
+)
+from api.dtos.responses.cursor_page_response_dto import CursorPageResponseDTO
+from api.dtos.responses.bulk_response_dto import BulkResponseDTO
 from api.dtos.responses.exception_response_dto import (
     ExceptionResponseDTO,
     ExceptionRateLimitResponseDTO
@@ -14,14 +26,18 @@ from api.dtos.responses.exception_response_dto import (
 from api.services.product_service import ProductService
 from api.dtos.responses.user_response_dto import UserResponseDTO
 
-from typing import List
-
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from core.config import settings
 from core.current_user import CurrentUser
 
+from typing import List
+
+from utils.storage import Storage
+from utils.http_cache import http_cache
+from utils.thumbnail import ImageSize
+
 
 product_router_v1 = APIRouter()
 product_service: ProductService = ProductService()
@@ -29,6 +45,18 @@ current_user = CurrentUser()
 limiter = Limiter(key_func=get_remote_address)
 
 
+def _sparse_page(
+    page: Page[ProductResponseDTO],
+    read: ProductReadRequestDTO
+) -> Page[ProductResponseDTO] | JSONResponse:
+    if read.fields == None:
+        return page
+
+    return JSONResponse(
+        content=page.model_dump(mode="json", exclude={"items": {"__all__": read.excluded_fields()}})
+    )
+
+
 @product_router_v1.post(
     "/",
     summary="Criar um novo produto",
@@ -51,6 +79,199 @@ async def store(
     return await product_service.store_service(productCreateRequestDTO)
 
 
+@product_router_v1.post(
+    "/bulk",
+    summary="Criar produtos em lote",
+    description="Retorna o resultado da criação de cada produto do lote",
+    status_code=status.HTTP_200_OK,
+    response_model=BulkResponseDTO,
+    responses={
+        401: {"model": ExceptionResponseDTO},
+        429: {"model": ExceptionRateLimitResponseDTO}
+    }
+)
+@limiter.limit(str(settings.REQUEST_PER_MINUTES) + "/minute")
+async def store_many(
+    request: Request,
+    productBulkCreateRequestDTO: ProductBulkCreateRequestDTO,
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+) -> BulkResponseDTO:
+    return await product_service.store_many_service(productBulkCreateRequestDTO.items)
+
+
+@product_router_v1.put(
+    "/bulk",
+    summary="Atualizar produtos em lote",
+    description="Retorna o resultado da atualização de cada produto do lote",
+    status_code=status.HTTP_200_OK,
+    response_model=BulkResponseDTO,
+    responses={
+        401: {"model": ExceptionResponseDTO},
+        404: {"model": ExceptionResponseDTO},
+        409: {"model": ExceptionResponseDTO},
+        429: {"model": ExceptionRateLimitResponseDTO}
+    }
+)
+@limiter.limit(str(settings.REQUEST_PER_MINUTES) + "/minute")
+async def update_many(
+    request: Request,
+    productBulkUpdateRequestDTO: ProductBulkUpdateRequestDTO,
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+) -> BulkResponseDTO:
+    return await product_service.update_many_service(productBulkUpdateRequestDTO.items)
+
+
+@product_router_v1.delete(
+    "/bulk",
+    summary="Remover produtos em lote",
+    description="Retorna o resultado da remoção de cada produto do lote",
+    status_code=status.HTTP_200_OK,
+    response_model=BulkResponseDTO,
+    responses={
+        401: {"model": ExceptionResponseDTO},
+        429: {"model": ExceptionRateLimitResponseDTO}
+    }
+)
+@limiter.limit(str(settings.REQUEST_PER_MINUTES) + "/minute")
+async def destroy_many(
+    request: Request,
+    batchRequestDTO: BatchRequestDTO,
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+) -> BulkResponseDTO:
+    return await product_service.destroy_many_service(batchRequestDTO.ids)
+
+
+@product_router_v1.post(
+    "/import",
+    summary="Importar produtos de um arquivo",
+    description="Importa em lotes um arquivo NDJSON ou CSV de produtos e retorna o resumo com os erros por linha",
+    status_code=status.HTTP_200_OK,
+    response_model=ProductImportResponseDTO,
+    responses={
+        400: {"model": ExceptionResponseDTO},
+        401: {"model": ExceptionResponseDTO},
+        429: {"model": ExceptionRateLimitResponseDTO}
+    }
+)
+@limiter.limit(str(settings.REQUEST_PER_MINUTES) + "/minute")
+async def import_file(
+    request: Request,
+    file: UploadFile,
+    format: ProductFileFormat = ProductFileFormat.ndjson,
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+) -> ProductImportResponseDTO:
+    return await product_service.import_service(file, format)
+
+
+@product_router_v1.post(
+    "/batch",
+    summary="Informações de vários produtos por ID",
+    description="Retorna os produtos encontrados na ordem solicitada e os IDs não encontrados",
+    status_code=status.HTTP_200_OK,
+    response_model=ProductBatchResponseDTO,
+    responses={
+        401: {"model": ExceptionResponseDTO}
+    }
+)
+async def show_many(
+    batchRequestDTO: BatchRequestDTO,
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+) -> ProductBatchResponseDTO:
+    products, missing = await product_service.show_many_service(batchRequestDTO.ids)
+    return ProductBatchResponseDTO(items=products, missing=missing)
+
+
+@product_router_v1.get(
+    "/export",
+    summary="Exportar o catálogo de produtos",
+    description="Retorna um arquivo NDJSON ou CSV com os produtos, opcionalmente filtrados por categoria",
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+            "description": "Retorna os produtos exportados",
+        },
+        401: {"model": ExceptionResponseDTO}
+    }
+)
+async def export(
+    format: ProductFileFormat = ProductFileFormat.ndjson,
+    category_id: str | None = None,
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+) -> StreamingResponse:
+    media_type: str = "text/csv" if format == ProductFileFormat.csv else "application/x-ndjson"
+
+    return StreamingResponse(
+        product_service.export_service(format, category_id),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=products.{format.value}"}
+    )
+
+
+@product_router_v1.get(
+    "/cursor",
+    summary="Lista de produtos cadastrados por cursor",
+    description="Retorna uma lista de produtos cadastrados paginada por cursor",
+    status_code=status.HTTP_200_OK,
+    response_model=CursorPageResponseDTO[ProductResponseDTO],
+    responses={
+        400: {"model": ExceptionResponseDTO},
+        401: {"model": ExceptionResponseDTO},
+        429: {"model": ExceptionRateLimitResponseDTO}
+    }
+)
+async def index_cursor(
+    cursor: str | None = None,
+    size: int = Query(50, ge=1, le=100),
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+) -> CursorPageResponseDTO[ProductResponseDTO]:
+    products, next_cursor = await product_service.index_cursor_service(cursor, size)
+    return CursorPageResponseDTO[ProductResponseDTO](
+        items=products,
+        size=size,
+        next_cursor=next_cursor
+    )
+
+
+@product_router_v1.get(
+    "/search",
+    summary="Pesquisar produtos por nome ou descrição",
+    description="Retorna uma lista paginada de produtos ordenada pela similaridade com o termo pesquisado",
+    status_code=status.HTTP_200_OK,
+    response_model=Page[ProductResponseDTO],
+    responses={
+        400: {"model": ExceptionResponseDTO},
+        401: {"model": ExceptionResponseDTO},
+        429: {"model": ExceptionRateLimitResponseDTO}
+    }
+)
+async def search(
+    q: str = Query(min_length=3, max_length=100),
+    params: Params = Depends(),
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+) -> Page[ProductResponseDTO]:
+    products, total = await product_service.search_service(q, params.page, params.size)
+    return create_page(products, total=total, params=params)
+
+
+@product_router_v1.get(
+    "/autocomplete",
+    summary="Autocompletar nomes de produtos",
+    description="Retorna os nomes de produtos que começam com o prefixo informado",
+    status_code=status.HTTP_200_OK,
+    response_model=List[str],
+    responses={
+        401: {"model": ExceptionResponseDTO}
+    }
+)
+async def autocomplete(
+    prefix: str = Query(min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+) -> List[str]:
+    return product_service.autocomplete_service(prefix, limit)
+
+
 @product_router_v1.get(
     "/{id}",
     summary="Informações do produto por ID",
@@ -58,16 +279,47 @@ async def store(
     status_code=status.HTTP_200_OK,
     response_model=ProductResponseDTO,
     responses={
+        304: {"description": "Produto não modificado"},
         401: {"model": ExceptionResponseDTO},
         404: {"model": ExceptionResponseDTO},
         429: {"model": ExceptionRateLimitResponseDTO}
     }
 )
 async def show(
+    request: Request,
+    response: Response,
     id: str, 
+    read: ProductReadRequestDTO = Query(),
     user_logged: UserResponseDTO = Depends(current_user.get_current_user)
 ) -> ProductResponseDTO:
-    return await product_service.show_service(id)
+    variant: str = read.variant()
+
+    if variant == "":
+        stamp = http_cache.stamp(f"product:{id}")
+
+        if stamp != None and http_cache.is_not_modified(request, stamp):
+            return http_cache.not_modified_response(stamp)
+
+    product: ProductResponseDTO = await product_service.show_service(id, read.includes_category())
+    updated_at = product.updated_at
+
+    if product.category != None and product.category.updated_at != None and updated_at != None:
+        updated_at = max(updated_at, product.category.updated_at)
+
+    stamp = http_cache.remember(f"product:{id}", updated_at, variant)
+
+    if http_cache.is_not_modified(request, stamp):
+        return http_cache.not_modified_response(stamp)
+
+    if read.fields != None:
+        return JSONResponse(
+            content=product.model_dump(mode="json", exclude=read.excluded_fields()),
+            headers=http_cache.headers(stamp)
+        )
+
+    response.headers.update(http_cache.headers(stamp))
+
+    return product
 
 
 @product_router_v1.get(
@@ -82,10 +334,17 @@ async def show(
     }
 )
 async def index(
+    params: Params = Depends(),
+    filters: ProductListFilterRequestDTO = Query(),
     user_logged: UserResponseDTO = Depends(current_user.get_current_user)
 ) -> Page[ProductResponseDTO]:
-    products: List[ProductResponseDTO] = await product_service.index_service()
-    return paginate(products)
+    products, total = await product_service.index_service(
+        params.page,
+        params.size,
+        filters,
+        filters.includes_category()
+    )
+    return _sparse_page(create_page(products, total=total, params=params), filters)
 
 
 @product_router_v1.get(
@@ -101,10 +360,48 @@ async def index(
 )
 async def index_by_category(
     category_id: str,
+    params: Params = Depends(),
+    filters: ProductListFilterRequestDTO = Query(),
     user_logged: UserResponseDTO = Depends(current_user.get_current_user)
 ) -> Page[ProductResponseDTO]:
-    products: List[ProductResponseDTO] = await product_service.index_by_category_service(category_id)
-    return paginate(products)
+    products, total = await product_service.index_by_category_service(
+        category_id,
+        params.page,
+        params.size,
+        filters,
+        filters.includes_category()
+    )
+    return _sparse_page(create_page(products, total=total, params=params), filters)
+
+
+@product_router_v1.get(
+    "/category/{category_id}/cursor",
+    summary="Lista de produtos cadastrados por categoria e cursor",
+    description="Retorna uma lista de produtos cadastrados por categoria paginada por cursor",
+    status_code=status.HTTP_200_OK,
+    response_model=CursorPageResponseDTO[ProductResponseDTO],
+    responses={
+        400: {"model": ExceptionResponseDTO},
+        401: {"model": ExceptionResponseDTO},
+        429: {"model": ExceptionRateLimitResponseDTO}
+    }
+)
+async def index_by_category_cursor(
+    category_id: str,
+    cursor: str | None = None,
+    size: int = Query(50, ge=1, le=100),
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+) -> CursorPageResponseDTO[ProductResponseDTO]:
+    products, next_cursor = await product_service.index_cursor_service(
+        cursor,
+        size,
+        category_id
+    )
+    return CursorPageResponseDTO[ProductResponseDTO](
+        items=products,
+        size=size,
+        next_cursor=next_cursor
+    )
 
 
 @product_router_v1.put(
@@ -140,6 +437,7 @@ async def update(
         401: {"model": ExceptionResponseDTO},
         404: {"model": ExceptionResponseDTO},
         406: {"model": ExceptionResponseDTO},
+        413: {"model": ExceptionResponseDTO},
         429: {"model": ExceptionRateLimitResponseDTO}
     }
 )
@@ -168,11 +466,15 @@ async def upload(
         429: {"model": ExceptionRateLimitResponseDTO}
     }
 )
-async def show_file(id: str, user_logged: UserResponseDTO = Depends(current_user.get_current_user)):
+async def show_file(
+    id: str,
+    size: ImageSize = ImageSize.original,
+    user_logged: UserResponseDTO = Depends(current_user.get_current_user)
+):
     product: ProductResponseDTO = await product_service.show_service(id)
     
     return FileResponse(
-        path=f"./{settings.UPLOAD_DIR}/products/{product.banner}",
+        path=Storage.file_path(product.banner, "products", size),
         filename=product.banner
     )
 
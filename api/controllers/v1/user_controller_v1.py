@@ -1,4 +1,4 @@
-from fastapi import APIRouter, status, Request, Depends, UploadFile
+from fastapi import APIRouter, status, Request, Response, Depends, UploadFile
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.security import OAuth2PasswordRequestForm
 
@@ -25,6 +25,10 @@ from core.config import settings
 from core.auth import Auth
 from core.current_user import CurrentUser
 
+from utils.storage import Storage
+from utils.http_cache import http_cache
+from utils.thumbnail import ImageSize
+
 
 user_router_v1 = APIRouter()
 auth_config = Auth()
@@ -89,13 +93,23 @@ async def signin(
     status_code=status.HTTP_200_OK,
     response_model=UserResponseDTO,
     responses={
+        304: {"description": "Usuário não modificado"},
         400: {"model": ExceptionResponseDTO},
         401: {"model": ExceptionResponseDTO},
     }
 )
 async def me(
+    request: Request,
+    response: Response,
     user_logged: UserResponseDTO = Depends(current_user.get_current_user)
 ) -> UserResponseDTO:
+    stamp = http_cache.remember(f"user:{user_logged.id}", user_logged.updated_at)
+
+    if http_cache.is_not_modified(request, stamp):
+        return http_cache.not_modified_response(stamp)
+
+    response.headers.update(http_cache.headers(stamp))
+
     return user_logged
 
 
@@ -153,6 +167,7 @@ async def update_password(
     responses={
         401: {"model": ExceptionResponseDTO},
         406: {"model": ExceptionResponseDTO},
+        413: {"model": ExceptionResponseDTO},
         429: {"model": ExceptionRateLimitResponseDTO}
     }
 )
@@ -176,10 +191,11 @@ async def upload(
     }
 )
 async def file(
+    size: ImageSize = ImageSize.original,
     user_logged: UserResponseDTO = Depends(current_user.get_current_user)
 ):
     return FileResponse(
-        path=f"./{settings.UPLOAD_DIR}/users/{user_logged.avatar}",
+        path=Storage.file_path(user_logged.avatar, "users", size),
         filename=user_logged.avatar
     )
     
\ No newline at end of file
@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+
+from typing import List
+
+from core.config import settings
+
+
+class BatchRequestDTO(BaseModel):
+    ids: List[str] = Field(min_length=1, max_length=settings.BATCH_MAX_IDS)
@@ -0,0 +1,46 @@
+from pydantic import BaseModel, Field
+
+from enum import Enum
+
+from datetime import datetime
+
+from typing import List
+
+
+class ListSort(str, Enum):
+    name = "name"
+    name_desc = "-name"
+    created_at = "createdAt"
+    created_at_desc = "-createdAt"
+    update_at = "updateAt"
+    update_at_desc = "-updateAt"
+
+
+class ListFilterRequestDTO(BaseModel):
+    sort: ListSort = ListSort.created_at
+    name: str | None = Field(None, min_length=1, max_length=100)
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+    def where(self) -> dict:
+        where: dict = {}
+
+        if self.name != None:
+            where["name"] = {"contains": self.name, "mode": "insensitive"}
+
+        if self.created_from != None or self.created_to != None:
+            where["createdAt"] = {}
+
+            if self.created_from != None:
+                where["createdAt"]["gte"] = self.created_from
+
+            if self.created_to != None:
+                where["createdAt"]["lte"] = self.created_to
+
+        return where
+
+    def order(self) -> List[dict]:
+        field: str = self.sort.value.lstrip("-")
+        direction: str = "desc" if self.sort.value.startswith("-") else "asc"
+
+        return [{field: direction}, {"id": direction}]
@@ -1,4 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
+
+from enum import Enum
+
+from typing import List, Set
+
+from core.config import settings
+
+from api.dtos.requests.list_request_dto import ListFilterRequestDTO
 
 
 class ProductCreateRequestDTO(BaseModel):
@@ -10,4 +18,95 @@ class ProductCreateRequestDTO(BaseModel):
 class ProductUpdateRequestDTO(BaseModel):
     name: str 
     description: str
-    
\ No newline at end of file
+
+
+class ProductBulkUpdateItemRequestDTO(ProductUpdateRequestDTO):
+    id: str
+
+
+class ProductBulkCreateRequestDTO(BaseModel):
+    items: List[ProductCreateRequestDTO] = Field(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+
+class ProductBulkUpdateRequestDTO(BaseModel):
+    items: List[ProductBulkUpdateItemRequestDTO] = Field(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+
+class ProductFileFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class ProductField(str, Enum):
+    id = "id"
+    name = "name"
+    description = "description"
+    banner = "banner"
+    banner_url = "banner_url"
+    category = "category"
+
+
+class ProductInclude(str, Enum):
+    category = "category"
+
+
+class ProductReadRequestDTO(BaseModel):
+    fields: str | None = Field(None, min_length=1, max_length=100)
+    include: ProductInclude | None = None
+
+    @field_validator("fields")
+    @classmethod
+    def validate_fields(cls, fields: str | None) -> str | None:
+        if fields != None:
+            for field in fields.split(","):
+                if field not in ProductField.__members__:
+                    raise ValueError(f"Campo inválido: {field}")
+
+        return fields
+
+    def includes_category(self) -> bool:
+        return self.include == ProductInclude.category
+
+    def field_set(self) -> Set[str] | None:
+        if self.fields == None:
+            return None
+
+        fields: Set[str] = set(self.fields.split(","))
+
+        if self.includes_category():
+            fields.add(ProductField.category.value)
+
+        return fields
+
+    def excluded_fields(self) -> Set[str]:
+        fields: Set[str] | None = self.field_set()
+
+        if fields == None:
+            return set()
+
+        return set(ProductField.__members__) - fields
+
+    def variant(self) -> str:
+        variant: str = ""
+
+        if self.fields != None:
+            variant += ";fields=" + "+".join(sorted(self.field_set()))
+
+        if self.includes_category():
+            variant += ";include=category"
+
+        return variant
+
+
+class ProductListFilterRequestDTO(ListFilterRequestDTO, ProductReadRequestDTO):
+    has_banner: bool | None = None
+
+    def where(self) -> dict:
+        where: dict = super().where()
+
+        if self.has_banner == True:
+            where["AND"] = [{"banner": {"not": ""}}, {"banner": {"not": None}}]
+        elif self.has_banner == False:
+            where["OR"] = [{"banner": ""}, {"banner": None}]
+
+        return where
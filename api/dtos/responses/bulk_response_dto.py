@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+from typing import List
+
+
+class BulkItemResponseDTO(BaseModel):
+    index: int
+    status: int
+    id: str | None = None
+    detail: str | None = None
+
+
+class BulkResponseDTO(BaseModel):
+    items: List[BulkItemResponseDTO]
+    succeeded: int
+    failed: int
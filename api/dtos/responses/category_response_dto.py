@@ -1,6 +1,16 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from datetime import datetime
+
+from typing import List
 
 
 class CategoryResponseDTO(BaseModel):
     id: str
     name: str
+    updated_at: datetime | None = Field(default=None, exclude=True)
+
+
+class CategoryBatchResponseDTO(BaseModel):
+    items: List[CategoryResponseDTO]
+    missing: List[str]
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+from typing import Generic, List, TypeVar
+
+
+T = TypeVar("T")
+
+
+class CursorPageResponseDTO(BaseModel, Generic[T]):
+    items: List[T]
+    size: int
+    next_cursor: str | None
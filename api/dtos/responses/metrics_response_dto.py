@@ -0,0 +1,46 @@
+from pydantic import BaseModel
+
+from typing import Dict
+
+
+class DatabaseMetricsResponseDTO(BaseModel):
+    connected: bool
+    pool_size: int
+    pool_timeout: int
+    connect_timeout: int
+    query_timeout: int
+    counters: Dict[str, int]
+    gauges: Dict[str, float]
+
+
+class CacheMetricsResponseDTO(BaseModel):
+    size: int
+    maxsize: int
+    ttl: float
+    hits: int
+    misses: int
+    evictions: int
+    hit_ratio: float
+
+
+class HashPoolMetricsResponseDTO(BaseModel):
+    executor: str
+    max_workers: int
+    running: int
+    waiting: int
+    max_waiting: int
+    completed: int
+    average_wait: float
+
+
+class SingleFlightMetricsResponseDTO(BaseModel):
+    in_flight: int
+    executed: int
+    shared: int
+
+
+class PrefixIndexMetricsResponseDTO(BaseModel):
+    ready: bool
+    size: int
+    memory_bytes: int
+    build_seconds: float
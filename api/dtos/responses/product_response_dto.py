@@ -1,4 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, computed_field, model_serializer
+
+from datetime import datetime
+
+from typing import List
+
+from api.dtos.responses.category_response_dto import CategoryResponseDTO
+
+from utils.signed_url import SignedUrl
 
 
 class ProductResponseDTO(BaseModel):
@@ -6,4 +14,38 @@ class ProductResponseDTO(BaseModel):
     name: str
     description: str
     banner: str
-    
\ No newline at end of file
+    updated_at: datetime | None = Field(default=None, exclude=True)
+    category: CategoryResponseDTO | None = None
+
+    @computed_field
+    @property
+    def banner_url(self) -> str | None:
+        return SignedUrl.generate("products", self.banner)
+
+    @model_serializer(mode="wrap")
+    def omit_missing_category(self, handler):
+        data = handler(self)
+
+        if self.category == None:
+            data.pop("category", None)
+
+        return data
+
+
+class ProductBatchResponseDTO(BaseModel):
+    items: List[ProductResponseDTO]
+    missing: List[str]
+
+
+class ProductImportErrorResponseDTO(BaseModel):
+    row: int
+    detail: str
+
+
+class ProductImportResponseDTO(BaseModel):
+    processed: int = 0
+    inserted: int = 0
+    failed: int = 0
+    batches: int = 0
+    errors: List[ProductImportErrorResponseDTO] = []
+    errors_truncated: bool = False
@@ -1,13 +1,23 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, computed_field
+
+from datetime import datetime
 
 from typing import List
 
+from utils.signed_url import SignedUrl
+
 
 class UserResponseDTO(BaseModel):
     id: str
     name: str
     email: EmailStr
     avatar: str
+    updated_at: datetime | None = Field(default=None, exclude=True)
+
+    @computed_field
+    @property
+    def avatar_url(self) -> str | None:
+        return SignedUrl.generate("users", self.avatar)
     
 
 class UserWithPassResponseDTO(UserResponseDTO):
@@ -1,93 +1,234 @@
+import asyncio
+
 from prisma import Prisma
 
+from core.config import settings
+from core.database import database
+
 from api.dtos.requests.category_request_dto import (
     CategoryCreateRequestDTO,
     CategoryUpdateRequestDTO
 )
+from api.dtos.requests.list_request_dto import ListFilterRequestDTO
 from api.dtos.responses.category_response_dto import CategoryResponseDTO
 
-from typing import List
+from datetime import datetime
+
+from typing import List, Tuple
+
+from utils.cursor import Cursor
+from utils.single_flight import single_flight
+from utils.cache import CacheBackend, MemoryCacheBackend
+
+
+category_cache: CacheBackend = MemoryCacheBackend(
+    maxsize=settings.CATALOG_CACHE_MAXSIZE,
+    ttl=settings.CATALOG_CACHE_TTL
+)
 
 
 class CategoryRepository:
-    def __init__(self):
-        self.prisma_db = Prisma()
+    def __init__(
+        self,
+        prisma_db: Prisma = database.prisma_db,
+        cache: CacheBackend = category_cache
+    ):
+        self.prisma_db = prisma_db
+        self.cache = cache
     
     async def store_repository(
         self, 
         user_id: str,
         categoryCreateRequestDTO: CategoryCreateRequestDTO
     ) -> CategoryResponseDTO:
-        await self.prisma_db.connect()
         category = await self.prisma_db.category.create({
             "name": categoryCreateRequestDTO.name,
             "userId": user_id
         })
-        await self.prisma_db.disconnect()
         
         return CategoryResponseDTO(
             id=category.id,
-            name=category.name
+            name=category.name,
+            updated_at=category.updateAt
         )
         
-    async def show_by_name_repository(
+    async def show_repository(
         self, 
-        name: str
+        id: str
     ) -> CategoryResponseDTO | None:
-        await self.prisma_db.connect()
-        category = await self.prisma_db.category.find_unique({"name": name})
-        await self.prisma_db.disconnect()
+        category: CategoryResponseDTO | None = await self.cache.get(f"id:{id}")
 
         if category != None:
-            return CategoryResponseDTO(
+            return category
+
+        return await single_flight.do(
+            ("category", "id", id),
+            self._find_unique_repository,
+            id
+        )
+
+    async def _find_unique_repository(self, id: str) -> CategoryResponseDTO | None:
+        reservation: int = await self.cache.reserve(f"id:{id}")
+
+        try:
+            category = await self.prisma_db.category.find_unique(where={"id": id})
+
+            if category != None:
+                category_dto: CategoryResponseDTO = CategoryResponseDTO(
+                    id=category.id,
+                    name=category.name,
+                    updated_at=category.updateAt
+                )
+                await self._remember(category_dto, reservation)
+
+                return category_dto
+
+            return None
+        finally:
+            await self.cache.release(f"id:{id}")
+
+    async def show_many_repository(self, ids: List[str]) -> List[CategoryResponseDTO]:
+        categories: List[CategoryResponseDTO] = []
+        missing: List[str] = []
+
+        for id in ids:
+            category: CategoryResponseDTO | None = await self.cache.get(f"id:{id}")
+
+            if category != None:
+                categories.append(category)
+            else:
+                missing.append(id)
+
+        if missing != []:
+            reservations: dict = {id: await self.cache.reserve(f"id:{id}") for id in missing}
+
+            try:
+                categories_db = await self.prisma_db.category.find_many(
+                    where={"id": {"in": missing}}
+                )
+
+                for category in categories_db:
+                    category_dto: CategoryResponseDTO = CategoryResponseDTO(
+                        id=category.id,
+                        name=category.name,
+                        updated_at=category.updateAt
+                    )
+                    await self._remember(category_dto, reservations[category.id])
+                    categories.append(category_dto)
+            finally:
+                for id in missing:
+                    await self.cache.release(f"id:{id}")
+
+        return categories
+
+    async def show_many_by_name_repository(self, names: List[str]) -> List[CategoryResponseDTO]:
+        categories_db = await self.prisma_db.category.find_many(
+            where={"name": {"in": names}}
+        )
+
+        return [
+            CategoryResponseDTO(
                 id=category.id,
-                name=category.name
+                name=category.name,
+                updated_at=category.updateAt
             )
+            for category in categories_db
+        ]
 
-        return None
+    async def _remember(self, category: CategoryResponseDTO, reservation: int) -> None:
+        await self.cache.set(f"id:{category.id}", category, reservation)
 
-    async def show_repository(
-        self, 
-        id: str
-    ) -> CategoryResponseDTO | None:
-        await self.prisma_db.connect()
-        category = await self.prisma_db.category.find_unique({"id": id})
-        await self.prisma_db.disconnect()
+    async def index_repository(
+        self,
+        user_id: str,
+        page: int,
+        size: int,
+        filters: ListFilterRequestDTO = ListFilterRequestDTO()
+    ) -> Tuple[List[CategoryResponseDTO], int]:
+        where: dict = filters.where()
+        where["userId"] = user_id
 
-        if category != None:
-            return CategoryResponseDTO(
+        categories_db, total = await asyncio.gather(
+            self.prisma_db.category.find_many(
+                where=where,
+                skip=(page - 1) * size,
+                take=size,
+                order=filters.order()
+            ),
+            self.prisma_db.category.count(where=where)
+        )
+
+        categories: List[CategoryResponseDTO] = [
+            CategoryResponseDTO(
                 id=category.id,
-                name=category.name
+                name=category.name,
+                updated_at=category.updateAt
             )
+            for category in categories_db
+        ]
 
-        return None
+        return categories, total
+    
+    async def index_cursor_repository(
+        self,
+        user_id: str,
+        after: Tuple[datetime, str] | None,
+        size: int
+    ) -> Tuple[List[CategoryResponseDTO], str | None]:
+        where: dict = {"userId": user_id}
 
-    async def index_repository(self, user_id: str) -> List[CategoryResponseDTO]:
-        await self.prisma_db.connect()
-        categories = await self.prisma_db.category.find_many(where={"userId": user_id})
-        await self.prisma_db.disconnect()
+        if after != None:
+            created_at, id = after
+            where["createdAt"] = {"gte": created_at}
+            where["OR"] = [
+                {"createdAt": {"gt": created_at}},
+                {"createdAt": created_at, "id": {"gt": id}}
+            ]
 
-        return categories
+        categories_db = await self.prisma_db.category.find_many(
+            where=where,
+            take=size + 1,
+            order=[{"createdAt": "asc"}, {"id": "asc"}]
+        )
+
+        next_cursor: str | None = None
+
+        if len(categories_db) > size:
+            categories_db = categories_db[:size]
+            next_cursor = Cursor.encode(categories_db[-1].createdAt, categories_db[-1].id)
+
+        categories: List[CategoryResponseDTO] = [
+            CategoryResponseDTO(
+                id=category.id,
+                name=category.name,
+                updated_at=category.updateAt
+            )
+            for category in categories_db
+        ]
+
+        return categories, next_cursor
     
     async def update_repository(
         self,
         id: str,
         categoryUpdateRequestDTO: CategoryUpdateRequestDTO
-    ) -> CategoryResponseDTO:
-        await self.prisma_db.connect()
+    ) -> CategoryResponseDTO | None:
         category = await self.prisma_db.category.update(
             data={"name": categoryUpdateRequestDTO.name},
             where={"id": id}
         )
-        await self.prisma_db.disconnect()
+        await self.cache.delete(f"id:{id}")
 
-        return CategoryResponseDTO(
-            id=category.id,
-            name=category.name
-        )
+        if category != None:
+            return CategoryResponseDTO(
+                id=category.id,
+                name=category.name,
+                updated_at=category.updateAt
+            )
+
+        return None
 
     async def destroy_repository(self, id: str) -> None:
-        await self.prisma_db.connect()
         await self.prisma_db.category.delete({"id": id})
-        await self.prisma_db.disconnect()
+        await self.cache.delete(f"id:{id}")
         
\ No newline at end of file
@@ -1,23 +1,52 @@
+import asyncio
+import time
+
 from prisma import Prisma
 
+from core.config import settings
+from core.database import database
+
 from api.dtos.requests.product_request_dto import (
     ProductCreateRequestDTO,
-    ProductUpdateRequestDTO
+    ProductUpdateRequestDTO,
+    ProductBulkUpdateItemRequestDTO,
+    ProductListFilterRequestDTO
 )
 from api.dtos.responses.product_response_dto import ProductResponseDTO
+from api.dtos.responses.category_response_dto import CategoryResponseDTO
+
+from datetime import datetime
+
+from typing import List, Tuple
 
-from typing import List
+from utils.cursor import Cursor
+from utils.single_flight import single_flight
+from utils.cache import CacheBackend, MemoryCacheBackend
+from utils.prefix_index import PrefixIndex
+
+
+product_cache: CacheBackend = MemoryCacheBackend(
+    maxsize=settings.CATALOG_CACHE_MAXSIZE,
+    ttl=settings.CATALOG_CACHE_TTL
+)
+product_name_index: PrefixIndex = PrefixIndex()
 
 
 class ProductRepository:
-    def __init__(self):
-        self.prisma_db = Prisma()
+    def __init__(
+        self,
+        prisma_db: Prisma = database.prisma_db,
+        cache: CacheBackend = product_cache,
+        name_index: PrefixIndex = product_name_index
+    ):
+        self.prisma_db = prisma_db
+        self.cache = cache
+        self.name_index = name_index
     
     async def store_repository(
         self,
         productCreateRequestDTO: ProductCreateRequestDTO
     ) -> ProductResponseDTO:
-        await self.prisma_db.connect()
         product = await self.prisma_db.product.create(
             data={
                 "name": productCreateRequestDTO.name,
@@ -25,71 +54,335 @@ class ProductRepository:
                 "categoryId": productCreateRequestDTO.category_id
             }
         )
-        await self.prisma_db.disconnect()
+        self.name_index.add(product.id, product.name)
 
         return ProductResponseDTO(
             id=product.id,
             name=product.name,
             description=product.description,
-            banner=product.banner
+            banner=product.banner,
+            updated_at=product.updateAt
         )
         
-    async def show_by_name_repository(self, name: str) -> ProductResponseDTO | None:
-        await self.prisma_db.connect()
+    async def show_repository(self, id: str) -> ProductResponseDTO | None:
+        product: ProductResponseDTO | None = await self.cache.get(f"id:{id}")
+
+        if product != None:
+            return product
+
+        return await single_flight.do(
+            ("product", "id", id),
+            self._find_unique_repository,
+            id
+        )
+
+    async def _find_unique_repository(self, id: str) -> ProductResponseDTO | None:
+        reservation: int = await self.cache.reserve(f"id:{id}")
+
+        try:
+            product = await self.prisma_db.product.find_unique(where={"id": id})
+
+            if product != None:
+                product_dto: ProductResponseDTO = ProductResponseDTO(
+                    id=product.id,
+                    name=product.name,
+                    description=product.description,
+                    banner=product.banner,
+                    updated_at=product.updateAt
+                )
+                await self._remember(product_dto, reservation)
+
+                return product_dto
+
+            return None
+        finally:
+            await self.cache.release(f"id:{id}")
+
+    async def show_with_category_repository(self, id: str) -> ProductResponseDTO | None:
         product = await self.prisma_db.product.find_unique(
-            where={"name": name}
+            where={"id": id},
+            include={"category": True}
         )
-        await self.prisma_db.disconnect()
 
         if product != None:
-            return ProductResponseDTO(
+            return self._with_category(product)
+
+        return None
+
+    def _with_category(self, product) -> ProductResponseDTO:
+        return ProductResponseDTO(
+            id=product.id,
+            name=product.name,
+            description=product.description,
+            banner=product.banner,
+            updated_at=product.updateAt,
+            category=CategoryResponseDTO(
+                id=product.category.id,
+                name=product.category.name,
+                updated_at=product.category.updateAt
+            ) if product.category != None else None
+        )
+
+    async def show_many_repository(self, ids: List[str]) -> List[ProductResponseDTO]:
+        products: List[ProductResponseDTO] = []
+        missing: List[str] = []
+
+        for id in ids:
+            product: ProductResponseDTO | None = await self.cache.get(f"id:{id}")
+
+            if product != None:
+                products.append(product)
+            else:
+                missing.append(id)
+
+        if missing != []:
+            reservations: dict = {id: await self.cache.reserve(f"id:{id}") for id in missing}
+
+            try:
+                products_db = await self.prisma_db.product.find_many(
+                    where={"id": {"in": missing}}
+                )
+
+                for product in products_db:
+                    product_dto: ProductResponseDTO = ProductResponseDTO(
+                        id=product.id,
+                        name=product.name,
+                        description=product.description,
+                        banner=product.banner,
+                        updated_at=product.updateAt
+                    )
+                    await self._remember(product_dto, reservations[product.id])
+                    products.append(product_dto)
+            finally:
+                for id in missing:
+                    await self.cache.release(f"id:{id}")
+
+        return products
+
+    async def show_many_by_name_repository(self, names: List[str]) -> List[ProductResponseDTO]:
+        products_db = await self.prisma_db.product.find_many(
+            where={"name": {"in": names}}
+        )
+
+        return [
+            ProductResponseDTO(
                 id=product.id,
                 name=product.name,
                 description=product.description,
-                banner=product.banner
+                banner=product.banner,
+                updated_at=product.updateAt
             )
+            for product in products_db
+        ]
 
-        return None
+    async def _remember(self, product: ProductResponseDTO, reservation: int) -> None:
+        await self.cache.set(f"id:{product.id}", product, reservation)
     
-    async def show_repository(self, id: str) -> ProductResponseDTO | None:
-        await self.prisma_db.connect()
-        product = await self.prisma_db.product.find_unique(
-            where={"id": id}
+    async def index_repository(
+        self,
+        page: int,
+        size: int,
+        filters: ProductListFilterRequestDTO = ProductListFilterRequestDTO(),
+        include_category: bool = False
+    ) -> Tuple[List[ProductResponseDTO], int]:
+        return await self._paginate_repository(
+            filters.where(),
+            page,
+            size,
+            filters.order(),
+            include_category
         )
-        await self.prisma_db.disconnect()
 
-        if product != None:
-            return ProductResponseDTO(
+    async def index_by_category_repository(
+        self,
+        category_id: str,
+        page: int,
+        size: int,
+        filters: ProductListFilterRequestDTO = ProductListFilterRequestDTO(),
+        include_category: bool = False
+    ) -> Tuple[List[ProductResponseDTO], int]:
+        where: dict = filters.where()
+        where["categoryId"] = category_id
+
+        return await self._paginate_repository(
+            where,
+            page,
+            size,
+            filters.order(),
+            include_category
+        )
+
+    async def _paginate_repository(
+        self,
+        where: dict,
+        page: int,
+        size: int,
+        order: List[dict],
+        include_category: bool = False
+    ) -> Tuple[List[ProductResponseDTO], int]:
+        products_db, total = await asyncio.gather(
+            self.prisma_db.product.find_many(
+                where=where,
+                skip=(page - 1) * size,
+                take=size,
+                order=order,
+                include={"category": True} if include_category else None
+            ),
+            self.prisma_db.product.count(where=where)
+        )
+
+        products: List[ProductResponseDTO] = [
+            self._with_category(product) for product in products_db
+        ]
+
+        return products, total
+    
+    async def search_repository(
+        self,
+        q: str,
+        page: int,
+        size: int
+    ) -> Tuple[List[ProductResponseDTO], int]:
+        pattern: str = "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        offset: int = (page - 1) * size
+        limit: int = min(size, settings.SEARCH_COUNT_LIMIT - offset)
+
+        count_query = self.prisma_db.query_first(
+            '''
+            SELECT COUNT(*)::int AS "total"
+            FROM (
+                SELECT 1
+                FROM "products"
+                WHERE "name" ILIKE $2 OR "name" %> $1 OR "description" %> $1
+                LIMIT $3
+            ) AS "matches"
+            ''',
+            q,
+            pattern,
+            settings.SEARCH_COUNT_LIMIT
+        )
+
+        if limit <= 0:
+            count = await count_query
+
+            return [], count["total"]
+
+        products_db, count = await asyncio.gather(
+            self.prisma_db.query_raw(
+                '''
+                WITH "matches" AS (
+                    (
+                        SELECT "id", "name" <->> $1 AS "distance"
+                        FROM "products"
+                        WHERE "name" ILIKE $2 OR "name" %> $1
+                        ORDER BY "name" <->> $1
+                        LIMIT $3
+                    )
+                    UNION ALL
+                    (
+                        SELECT "id", "description" <->> $1 AS "distance"
+                        FROM "products"
+                        WHERE "description" %> $1
+                        ORDER BY "description" <->> $1
+                        LIMIT $3
+                    )
+                )
+                SELECT "p"."id", "p"."name", "p"."description", "p"."banner", "p"."updateAt"
+                FROM (
+                    SELECT "id", MIN("distance") AS "distance"
+                    FROM "matches"
+                    GROUP BY "id"
+                ) AS "ranked"
+                JOIN "products" AS "p" ON "p"."id" = "ranked"."id"
+                ORDER BY "ranked"."distance" ASC, "p"."name" ASC, "p"."id" ASC
+                LIMIT $4 OFFSET $5
+                ''',
+                q,
+                pattern,
+                offset + limit,
+                limit,
+                offset
+            ),
+            count_query
+        )
+
+        products: List[ProductResponseDTO] = [
+            ProductResponseDTO(
+                id=product["id"],
+                name=product["name"],
+                description=product["description"],
+                banner=product["banner"],
+                updated_at=product["updateAt"]
+            )
+            for product in products_db
+        ]
+
+        return products, count["total"]
+    
+    async def index_cursor_repository(
+        self,
+        after: Tuple[datetime, str] | None,
+        size: int,
+        category_id: str | None = None
+    ) -> Tuple[List[ProductResponseDTO], str | None]:
+        where: dict = {}
+
+        if category_id != None:
+            where["categoryId"] = category_id
+
+        if after != None:
+            created_at, id = after
+            where["createdAt"] = {"gte": created_at}
+            where["OR"] = [
+                {"createdAt": {"gt": created_at}},
+                {"createdAt": created_at, "id": {"gt": id}}
+            ]
+
+        products_db = await self.prisma_db.product.find_many(
+            where=where,
+            take=size + 1,
+            order=[{"createdAt": "asc"}, {"id": "asc"}]
+        )
+
+        next_cursor: str | None = None
+
+        if len(products_db) > size:
+            products_db = products_db[:size]
+            next_cursor = Cursor.encode(products_db[-1].createdAt, products_db[-1].id)
+
+        products: List[ProductResponseDTO] = [
+            ProductResponseDTO(
                 id=product.id,
                 name=product.name,
                 description=product.description,
-                banner=product.banner
+                banner=product.banner,
+                updated_at=product.updateAt
             )
+            for product in products_db
+        ]
 
-        return None
+        return products, next_cursor
     
-    async def index_repository(self) -> List[ProductResponseDTO]:
-        await self.prisma_db.connect()
-        products_db = await self.prisma_db.product.find_many()
-        await self.prisma_db.disconnect()
-        
-        return products_db
-
-    async def index_by_category_repository(self, category_id) -> List[ProductResponseDTO]:
-        await self.prisma_db.connect()
-        products_db = await self.prisma_db.product.find_many(
-            where={"categoryId": category_id}
+    async def store_many_repository(
+        self,
+        productCreateRequestDTOs: List[ProductCreateRequestDTO]
+    ) -> int:
+        return await self.prisma_db.product.create_many(
+            data=[
+                {
+                    "name": productCreateRequestDTO.name,
+                    "description": productCreateRequestDTO.description,
+                    "categoryId": productCreateRequestDTO.category_id
+                }
+                for productCreateRequestDTO in productCreateRequestDTOs
+            ]
         )
-        await self.prisma_db.disconnect()
-        
-        return products_db
     
     async def update_repository(
         self,
         id: str,
         productUpdateRequestDTO: ProductUpdateRequestDTO
-    ) -> ProductResponseDTO:
-        await self.prisma_db.connect()
+    ) -> ProductResponseDTO | None:
         product = await self.prisma_db.product.update(
             data={
                 "name": productUpdateRequestDTO.name,
@@ -97,32 +390,103 @@ class ProductRepository:
             },
             where={"id": id}
         )
-        await self.prisma_db.disconnect()
+        await self.cache.delete(f"id:{id}")
 
-        return ProductResponseDTO(
-            id=product.id,
-            name=product.name,
-            description=product.description,
-            banner=product.banner
-        )
+        if product != None:
+            self.name_index.add(product.id, product.name)
+
+            return ProductResponseDTO(
+                id=product.id,
+                name=product.name,
+                description=product.description,
+                banner=product.banner,
+                updated_at=product.updateAt
+            )
+
+        return None
+    
+    async def update_many_repository(
+        self,
+        productBulkUpdateItemRequestDTOs: List[ProductBulkUpdateItemRequestDTO]
+    ) -> None:
+        async with self.prisma_db.batch_() as batcher:
+            for productBulkUpdateItemRequestDTO in productBulkUpdateItemRequestDTOs:
+                batcher.product.update(
+                    data={
+                        "name": productBulkUpdateItemRequestDTO.name,
+                        "description": productBulkUpdateItemRequestDTO.description
+                    },
+                    where={"id": productBulkUpdateItemRequestDTO.id}
+                )
+
+        for productBulkUpdateItemRequestDTO in productBulkUpdateItemRequestDTOs:
+            await self.cache.delete(f"id:{productBulkUpdateItemRequestDTO.id}")
+            self.name_index.add(
+                productBulkUpdateItemRequestDTO.id,
+                productBulkUpdateItemRequestDTO.name
+            )
     
     async def upload_repository(self, id: str, banner: str) -> ProductResponseDTO:
-        await self.prisma_db.connect()
         product = await self.prisma_db.product.update(
             data={"banner": banner},
             where={"id": id}
         )
-        await self.prisma_db.disconnect()
+        await self.cache.delete(f"id:{id}")
 
         return ProductResponseDTO(
             id=product.id,
             name=product.name,
             description=product.description,
-            banner=product.banner
+            banner=product.banner,
+            updated_at=product.updateAt
+        )
+    
+    async def exists_by_category_repository(self, category_id: str) -> bool:
+        total: int = await self.prisma_db.product.count(
+            where={"categoryId": category_id},
+            take=1
         )
+
+        return total > 0
+    
+    async def count_by_banner_repository(self, banner: str) -> int:
+        return await self.prisma_db.product.count(where={"banner": banner})
     
     async def destroy_repository(self, id: str) -> None:
-        await self.prisma_db.connect()
         await self.prisma_db.product.delete({"id": id})
-        await self.prisma_db.disconnect()
-        
\ No newline at end of file
+        await self.cache.delete(f"id:{id}")
+        self.name_index.remove(id)
+
+    async def destroy_many_repository(self, ids: List[str]) -> List[str]:
+        placeholders: str = ", ".join(f"${index}" for index in range(1, len(ids) + 1))
+        products_db = await self.prisma_db.query_raw(
+            f'DELETE FROM "products" WHERE "id" IN ({placeholders}) RETURNING "id"',
+            *ids
+        )
+
+        for id in ids:
+            await self.cache.delete(f"id:{id}")
+            self.name_index.remove(id)
+
+        return [product["id"] for product in products_db]
+
+    async def load_name_index_repository(self) -> None:
+        started: float = time.perf_counter()
+        items: List[Tuple[str, str]] = []
+        after: str | None = None
+
+        while True:
+            products_db = await self.prisma_db.product.find_many(
+                where={"id": {"gt": after}} if after != None else {},
+                take=settings.PREFIX_INDEX_CHUNK_SIZE,
+                order={"id": "asc"}
+            )
+
+            items.extend((product.id, product.name) for product in products_db)
+
+            if len(products_db) < settings.PREFIX_INDEX_CHUNK_SIZE:
+                break
+
+            after = products_db[-1].id
+
+        self.name_index.build(items, started)
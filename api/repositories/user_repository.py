@@ -1,5 +1,7 @@
 from prisma import Prisma
 
+from core.database import database
+
 from api.dtos.requests.user_request_dto import (
     UserCreateRequestDTO,
     UserUpdateRequestDTO
@@ -11,38 +13,33 @@ from api.dtos.responses.user_response_dto import (
 
 
 class UserRepository:
-    def __init__(self):
-        self.prisma_db = Prisma()
+    def __init__(self, prisma_db: Prisma = database.prisma_db):
+        self.prisma_db = prisma_db
         
     async def signup_repository(
         self,
         userCreateRequestDTO: UserCreateRequestDTO,
         hash: str
     ) -> UserResponseDTO:
-        await self.prisma_db.connect()
-        
         user = await self.prisma_db.user.create({
             "name": userCreateRequestDTO.name,
             "email": userCreateRequestDTO.email,
             "password": hash
         })
-        
-        await self.prisma_db.disconnect()
 
         return UserResponseDTO(
             id=user.id,
             name=user.name,
             email=user.email,
-            avatar=user.avatar
+            avatar=user.avatar,
+            updated_at=user.updateAt
         )
     
     async def show_by_email_repository(
         self, 
         email: str
     ) -> UserWithPassResponseDTO | None:
-        await self.prisma_db.connect()
         user = await self.prisma_db.user.find_unique({"email": email})
-        await self.prisma_db.disconnect()
 
         if user != None:
             return UserWithPassResponseDTO(
@@ -50,22 +47,22 @@ class UserRepository:
                 name=user.name,
                 email=user.email,
                 password=user.password,
-                avatar=user.avatar
+                avatar=user.avatar,
+                updated_at=user.updateAt
             )
 
         return None
     
     async def show_repository(self, id: str) -> UserResponseDTO | None:
-        await self.prisma_db.connect()
         user = await self.prisma_db.user.find_unique({"id": id})
-        await self.prisma_db.disconnect()
 
         if user != None:
             return UserResponseDTO(
                 id=user.id,
                 name=user.name,
                 email=user.email,
-                avatar=user.avatar
+                avatar=user.avatar,
+                updated_at=user.updateAt
             )
 
         return None
@@ -74,56 +71,61 @@ class UserRepository:
         self,
         id: str,
         userUpdateRequestDTO: UserUpdateRequestDTO
-    ) -> UserResponseDTO:
-        await self.prisma_db.connect()
+    ) -> UserResponseDTO | None:
         user = await self.prisma_db.user.update(
             data={"name": userUpdateRequestDTO.name},
             where={"id": id}
         )
-        await self.prisma_db.disconnect()
 
-        return UserResponseDTO(
-            id=user.id,
-            name=user.name,
-            email=user.email,
-            avatar=user.avatar
-        )
+        if user != None:
+            return UserResponseDTO(
+                id=user.id,
+                name=user.name,
+                email=user.email,
+                avatar=user.avatar,
+                updated_at=user.updateAt
+            )
+
+        return None
         
     async def update_password_repository(
         self, 
         id: str, 
         hash: str
-    ) -> UserResponseDTO:
-        await self.prisma_db.connect()
+    ) -> UserResponseDTO | None:
         user = await self.prisma_db.user.update(
             data={"password": hash},
             where={"id": id}
         )
-        await self.prisma_db.disconnect()
 
-        return UserResponseDTO(
-            id=user.id,
-            name=user.name,
-            email=user.email,
-            avatar=user.avatar
-        )
+        if user != None:
+            return UserResponseDTO(
+                id=user.id,
+                name=user.name,
+                email=user.email,
+                avatar=user.avatar,
+                updated_at=user.updateAt
+            )
+
+        return None
     
     async def upload_repository(
         self, 
         id: str, 
         avatar: str
     ) -> UserResponseDTO:
-        await self.prisma_db.connect()
         user = await self.prisma_db.user.update(
             data={"avatar": avatar},
             where={"id": id}
         )
-        await self.prisma_db.disconnect()
 
         return UserResponseDTO(
             id=user.id,
             name=user.name,
             email=user.email,
-            avatar=user.avatar
+            avatar=user.avatar,
+            updated_at=user.updateAt
         )
-    
\ No newline at end of file
+
+    async def count_by_avatar_repository(self, avatar: str) -> int:
+        return await self.prisma_db.user.count(where={"avatar": avatar})
@@ -3,7 +3,9 @@ from fastapi import APIRouter
 from api.controllers.v1 import (
     user_controller_v1,
     category_controller_v1,
-    product_controller_v1
+    product_controller_v1,
+    file_controller_v1,
+    metrics_controller_v1
 )
 
 from core.config import settings
@@ -27,4 +29,14 @@ if settings.API_VERSION == "v1":
         prefix="/products",
         tags=["Products"]
     )
+    api_router.include_router(
+        file_controller_v1.file_router_v1,
+        prefix="/files",
+        tags=["Files"]
+    )
+    api_router.include_router(
+        metrics_controller_v1.metrics_router_v1,
+        prefix="/metrics",
+        tags=["Metrics"]
+    )
     
\ No newline at end of file
@@ -4,36 +4,39 @@ from api.dtos.requests.category_request_dto import (
     CategoryCreateRequestDTO,
     CategoryUpdateRequestDTO
 )
-from api.dtos.responses.product_response_dto import ProductResponseDTO
+from api.dtos.requests.list_request_dto import ListFilterRequestDTO
 from api.dtos.responses.category_response_dto import CategoryResponseDTO
 from api.exceptions.http_exception import Exception
 
 from fastapi import status
 
-from typing import List
+from prisma.errors import ForeignKeyViolationError, UniqueViolationError
+
+from datetime import datetime
+
+from typing import List, Tuple
+
+from utils.cursor import Cursor
+from utils.http_cache import http_cache
 
 
 class CategoryService(CategoryRepository):
     def __init__(self):
         super().__init__()
         self.exception = Exception()
-        self.product_repository = ProductRepository
+        self.product_repository = ProductRepository()
     
     async def store_service(
         self, 
         user_id: str,
         categoryCreateRequestDTO: CategoryCreateRequestDTO) -> CategoryResponseDTO:
-        category_name_exists: CategoryResponseDTO | None = await self.show_by_name_repository(
-            categoryCreateRequestDTO.name
-        )
-
-        if category_name_exists != None:
+        try:
+            category: CategoryResponseDTO = await self.store_repository(user_id, categoryCreateRequestDTO)
+        except UniqueViolationError:
             raise self.exception.exception_error(
                 "Categoria já está cadastrada",
                 status.HTTP_409_CONFLICT
             )
-
-        category: CategoryResponseDTO = await self.store_repository(user_id, categoryCreateRequestDTO)
         
         return category
     
@@ -48,38 +51,75 @@ class CategoryService(CategoryRepository):
 
         return category
     
-    async def index_service(self, user_id: str) -> List[CategoryResponseDTO]:
-        categories: List[CategoryResponseDTO] = await self.index_repository(user_id)
+    async def show_many_service(
+        self,
+        ids: List[str]
+    ) -> Tuple[List[CategoryResponseDTO], List[str]]:
+        ids = list(dict.fromkeys(ids))
+        categories: dict = {
+            category.id: category for category in await self.show_many_repository(ids)
+        }
+
+        return (
+            [categories[id] for id in ids if id in categories],
+            [id for id in ids if id not in categories]
+        )
+    
+    async def index_service(
+        self,
+        user_id: str,
+        page: int,
+        size: int,
+        filters: ListFilterRequestDTO
+    ) -> Tuple[List[CategoryResponseDTO], int]:
+        categories, total = await self.index_repository(user_id, page, size, filters)
         
-        return categories
+        return categories, total
+    
+    async def index_cursor_service(
+        self,
+        user_id: str,
+        cursor: str | None,
+        size: int
+    ) -> Tuple[List[CategoryResponseDTO], str | None]:
+        after: Tuple[datetime, str] | None = None
+
+        if cursor != None:
+            after = Cursor.decode(cursor)
+
+            if after == None:
+                raise self.exception.exception_error(
+                    "Cursor inválido",
+                    status.HTTP_400_BAD_REQUEST
+                )
+
+        categories, next_cursor = await self.index_cursor_repository(user_id, after, size)
+
+        return categories, next_cursor
     
     async def update_service(
         self,
         id: str,
         categoryUpdateRequestDTO: CategoryUpdateRequestDTO
     ) -> CategoryResponseDTO:
-        category_exists: CategoryResponseDTO | None = await self.show_repository(id)
-
-        if category_exists == None:
-            raise self.exception.exception_error(
-                "Categoria não encontrada",
-                status.HTTP_404_NOT_FOUND
+        try:
+            category: CategoryResponseDTO | None = await self.update_repository(
+                id,
+                categoryUpdateRequestDTO
             )
-
-        category_name_exists: CategoryResponseDTO | None = await self.show_by_name_repository(
-            categoryUpdateRequestDTO.name
-        )
-
-        if category_name_exists != None:
+        except UniqueViolationError:
             raise self.exception.exception_error(
                 "Nome da categoria já existe",
                 status.HTTP_409_CONFLICT
             )
 
-        category: CategoryResponseDTO = await self.update_repository(
-            id,
-            categoryUpdateRequestDTO
-        )
+        if category == None:
+            raise self.exception.exception_error(
+                "Categoria não encontrada",
+                status.HTTP_404_NOT_FOUND
+            )
+
+        http_cache.forget(f"category:{id}")
 
         return category
     
@@ -92,13 +132,21 @@ class CategoryService(CategoryRepository):
                 status.HTTP_404_NOT_FOUND
             )
 
-        products: List[ProductResponseDTO] = await self.product_repository.index_by_category_repository(id)
+        has_products: bool = await self.product_repository.exists_by_category_repository(id)
         
-        if products != []:
+        if has_products:
             raise self.exception.exception_error(
                 "Categoria possui produtos cadastrados",
                 status.HTTP_422_UNPROCESSABLE_ENTITY
             )
         
-        await self.destroy_repository(id)
+        try:
+            await self.destroy_repository(id)
+        except ForeignKeyViolationError:
+            raise self.exception.exception_error(
+                "Categoria possui produtos cadastrados",
+                status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+
+        http_cache.forget(f"category:{id}")
         
\ No newline at end of file
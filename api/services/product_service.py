@@ -1,56 +1,89 @@
+import asyncio
+import csv
+import io
+import itertools
+import json
+import logging
+
 from api.repositories.product_repository import ProductRepository
+from api.repositories.category_repository import CategoryRepository
 from api.exceptions.http_exception import Exception
 from api.dtos.requests.product_request_dto import (
     ProductCreateRequestDTO,
-    ProductUpdateRequestDTO
+    ProductUpdateRequestDTO,
+    ProductBulkUpdateItemRequestDTO,
+    ProductListFilterRequestDTO,
+    ProductFileFormat
+)
+from api.dtos.responses.product_response_dto import (
+    ProductResponseDTO,
+    ProductImportErrorResponseDTO,
+    ProductImportResponseDTO
+)
+from api.dtos.responses.bulk_response_dto import (
+    BulkItemResponseDTO,
+    BulkResponseDTO
 )
-from api.dtos.responses.product_response_dto import ProductResponseDTO
-from api.dtos.responses.category_response_dto import CategoryResponseDTO
-from api.services.category_service import CategoryService
 
 from fastapi import status, UploadFile
 
-from typing import List
+from prisma.errors import (
+    UniqueViolationError,
+    ForeignKeyViolationError,
+    RecordNotFoundError
+)
+
+from pydantic import ValidationError
+
+from core.config import settings
+
+from datetime import datetime
+
+from typing import AsyncIterator, Iterator, List, Tuple
 
 from utils.storage import Storage
+from utils.http_cache import http_cache
+from utils.thumbnail import Thumbnail
+from utils.cursor import Cursor
+
+
+logger = logging.getLogger(__name__)
 
 
 class ProductService(ProductRepository):
     def __init__(self):
         super().__init__()
         self.exception = Exception()
-        self.category_service = CategoryService()
+        self.category_repository = CategoryRepository()
         
     async def store_service(
         self,
         productCreateRequestDTO: ProductCreateRequestDTO
     ) -> ProductResponseDTO:
-        category_exists: CategoryResponseDTO | None = await self.category_service.show_service(
-            productCreateRequestDTO.category_id
-        )
-
-        if category_exists == None:
+        try:
+            product: ProductResponseDTO = await self.store_repository(productCreateRequestDTO)
+        except ForeignKeyViolationError:
             raise self.exception.exception_error(
                 "Categoria não encontrada",
                 status.HTTP_404_NOT_FOUND
             )
-
-        product_name_exists: ProductResponseDTO | None = await self.show_by_name_repository(
-            productCreateRequestDTO.name
-        )
-
-        if product_name_exists != None:
+        except UniqueViolationError:
             raise self.exception.exception_error(
                 "Nome do produto já existe",
                 status.HTTP_409_CONFLICT
             )
-
-        product: ProductResponseDTO = await self.store_repository(productCreateRequestDTO)
         
         return product
     
-    async def show_service(self, id: str) -> ProductResponseDTO:
-        product: ProductResponseDTO | None = await self.show_repository(id)
+    async def show_service(
+        self,
+        id: str,
+        include_category: bool = False
+    ) -> ProductResponseDTO:
+        if include_category:
+            product: ProductResponseDTO | None = await self.show_with_category_repository(id)
+        else:
+            product: ProductResponseDTO | None = await self.show_repository(id)
 
         if product == None:
             raise self.exception.exception_error(
@@ -60,43 +93,296 @@ class ProductService(ProductRepository):
 
         return product
     
-    async def index_service(self) -> List[ProductResponseDTO]:
-        products: List[ProductResponseDTO] = await self.index_repository()
+    async def show_many_service(
+        self,
+        ids: List[str]
+    ) -> Tuple[List[ProductResponseDTO], List[str]]:
+        ids = list(dict.fromkeys(ids))
+        products: dict = {
+            product.id: product for product in await self.show_many_repository(ids)
+        }
+
+        return (
+            [products[id] for id in ids if id in products],
+            [id for id in ids if id not in products]
+        )
+    
+    async def index_service(
+        self,
+        page: int,
+        size: int,
+        filters: ProductListFilterRequestDTO,
+        include_category: bool = False
+    ) -> Tuple[List[ProductResponseDTO], int]:
+        products, total = await self.index_repository(page, size, filters, include_category)
         
-        return products
+        return products, total
     
-    async def index_by_category_service(self, category_id: str) -> List[ProductResponseDTO]:
-        products: List[ProductResponseDTO] = await self.index_by_category_repository(category_id)
+    async def index_by_category_service(
+        self,
+        category_id: str,
+        page: int,
+        size: int,
+        filters: ProductListFilterRequestDTO,
+        include_category: bool = False
+    ) -> Tuple[List[ProductResponseDTO], int]:
+        products, total = await self.index_by_category_repository(
+            category_id,
+            page,
+            size,
+            filters,
+            include_category
+        )
         
-        return products
+        return products, total
     
-    async def update_service(
+    async def search_service(
         self,
-        id: str,
-        productUpdateRequestDTO: ProductUpdateRequestDTO
-    ) -> ProductResponseDTO:
-        product_exists: ProductResponseDTO | None = await self.show_repository(id)
+        q: str,
+        page: int,
+        size: int
+    ) -> Tuple[List[ProductResponseDTO], int]:
+        q = q.strip()
 
-        if (product_exists == None):
+        if len(q) < 3:
             raise self.exception.exception_error(
-                "Produto não encontrado",
-                status.HTTP_404_NOT_FOUND
+                "Termo de pesquisa deve ter no mínimo 3 caracteres",
+                status.HTTP_400_BAD_REQUEST
             )
 
-        product_name_exists: ProductResponseDTO | None = await self.show_by_name_repository(
-            productUpdateRequestDTO.name
-        )
+        products, total = await self.search_repository(q, page, size)
 
-        if product_name_exists != None:
+        return products, total
+    
+    def autocomplete_service(self, prefix: str, limit: int) -> List[str]:
+        return self.name_index.search(prefix, limit)
+    
+    async def index_cursor_service(
+        self,
+        cursor: str | None,
+        size: int,
+        category_id: str | None = None
+    ) -> Tuple[List[ProductResponseDTO], str | None]:
+        after: Tuple[datetime, str] | None = None
+
+        if cursor != None:
+            after = Cursor.decode(cursor)
+
+            if after == None:
+                raise self.exception.exception_error(
+                    "Cursor inválido",
+                    status.HTTP_400_BAD_REQUEST
+                )
+
+        products, next_cursor = await self.index_cursor_repository(after, size, category_id)
+
+        return products, next_cursor
+    
+    async def export_service(
+        self,
+        format: ProductFileFormat,
+        category_id: str | None = None
+    ) -> AsyncIterator[str]:
+        fields: List[str] = ["id", "name", "description", "banner"]
+        next_cursor: str | None = None
+        after: Tuple[datetime, str] | None = None
+
+        if format == ProductFileFormat.csv:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow(fields)
+            yield buffer.getvalue()
+
+        while True:
+            products, next_cursor = await self.index_cursor_repository(
+                after,
+                settings.EXPORT_CHUNK_SIZE,
+                category_id
+            )
+
+            if format == ProductFileFormat.csv:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows(
+                    [getattr(product, field) for field in fields] for product in products
+                )
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    product.model_dump_json(include=set(fields)) + "\n" for product in products
+                )
+
+            if next_cursor == None:
+                break
+
+            after = Cursor.decode(next_cursor)
+    
+    async def import_service(
+        self,
+        file: UploadFile,
+        format: ProductFileFormat
+    ) -> ProductImportResponseDTO:
+        summary: ProductImportResponseDTO = ProductImportResponseDTO()
+        categories: dict = {}
+        text = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        rows: Iterator[Tuple[int, dict | None, str | None]] = self._read_rows(text, format)
+
+        try:
+            while True:
+                batch: List[Tuple[int, dict | None, str | None]] = await asyncio.to_thread(
+                    list,
+                    itertools.islice(rows, settings.IMPORT_BATCH_SIZE)
+                )
+
+                if batch == []:
+                    break
+
+                await self._import_batch(batch, categories, summary)
+                logger.info(
+                    "product import batch %s: processed=%s inserted=%s failed=%s",
+                    summary.batches,
+                    summary.processed,
+                    summary.inserted,
+                    summary.failed
+                )
+        except (csv.Error, UnicodeDecodeError):
+            raise self.exception.exception_error(
+                "Arquivo inválido",
+                status.HTTP_400_BAD_REQUEST
+            )
+        finally:
+            text.detach()
+
+        return summary
+
+    def _read_rows(
+        self,
+        text: io.TextIOWrapper,
+        format: ProductFileFormat
+    ) -> Iterator[Tuple[int, dict | None, str | None]]:
+        if format == ProductFileFormat.csv:
+            for row_number, row in enumerate(csv.DictReader(text), start=2):
+                yield row_number, row, None
+
+            return
+
+        for row_number, line in enumerate(text, start=1):
+            if line.strip() == "":
+                continue
+
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                yield row_number, None, "JSON inválido"
+                continue
+
+            if not isinstance(row, dict):
+                yield row_number, None, "JSON inválido"
+                continue
+
+            yield row_number, row, None
+
+    async def _import_batch(
+        self,
+        batch: List[Tuple[int, dict | None, str | None]],
+        categories: dict,
+        summary: ProductImportResponseDTO
+    ) -> None:
+        names: List[str] = list({
+            row["category"] for _, row, _ in batch
+            if row != None and not row.get("category_id") and isinstance(row.get("category"), str)
+            and row["category"] != "" and row["category"] not in categories
+        })
+
+        if names != []:
+            categories.update({name: None for name in names})
+            categories.update({
+                category.name: category.id
+                for category in await self.category_repository.show_many_by_name_repository(names)
+            })
+
+        row_numbers: List[int] = []
+        items: List[ProductCreateRequestDTO] = []
+
+        for row_number, row, error in batch:
+            summary.processed += 1
+
+            if error != None:
+                self._import_error(summary, row_number, error)
+                continue
+
+            category: str | None = row.get("category")
+
+            if category != None and not isinstance(category, str):
+                self._import_error(summary, row_number, "category: Categoria inválida")
+                continue
+
+            category_id: str | None = row.get("category_id") or categories.get(category)
+
+            if category_id == None:
+                self._import_error(summary, row_number, "Categoria não encontrada")
+                continue
+
+            try:
+                items.append(ProductCreateRequestDTO(
+                    name=row.get("name"),
+                    description=row.get("description"),
+                    category_id=category_id
+                ))
+            except ValidationError as e:
+                self._import_error(summary, row_number, "; ".join(
+                    f"{'.'.join(str(loc) for loc in detail['loc'])}: {detail['msg']}"
+                    for detail in e.errors()
+                ))
+                continue
+
+            row_numbers.append(row_number)
+
+        if items != []:
+            result: BulkResponseDTO = await self.store_many_service(items)
+            summary.inserted += result.succeeded
+
+            for item in result.items:
+                if item.status >= 400:
+                    self._import_error(summary, row_numbers[item.index], item.detail)
+
+        summary.batches += 1
+
+    def _import_error(
+        self,
+        summary: ProductImportResponseDTO,
+        row: int,
+        detail: str
+    ) -> None:
+        summary.failed += 1
+
+        if len(summary.errors) < settings.IMPORT_MAX_ERRORS:
+            summary.errors.append(ProductImportErrorResponseDTO(row=row, detail=detail))
+        else:
+            summary.errors_truncated = True
+    
+    async def update_service(
+        self,
+        id: str,
+        productUpdateRequestDTO: ProductUpdateRequestDTO
+    ) -> ProductResponseDTO:
+        try:
+            product: ProductResponseDTO | None = await self.update_repository(
+                id,
+                productUpdateRequestDTO
+            )
+        except UniqueViolationError:
             raise self.exception.exception_error(
                 "Nome do produto já existe",
                 status.HTTP_409_CONFLICT
             )
 
-        product: ProductResponseDTO = await self.update_repository(
-            id,
-            productUpdateRequestDTO
-        )
+        if product == None:
+            raise self.exception.exception_error(
+                "Produto não encontrado",
+                status.HTTP_404_NOT_FOUND
+            )
+
+        http_cache.forget(f"product:{id}")
 
         return product
     
@@ -113,23 +399,54 @@ class ProductService(ProductRepository):
                 status.HTTP_404_NOT_FOUND
             )
         
-        banner_verify: bool = Storage.verify_ext_file(banner)
+        banner_ext: str | None = await Storage.verify_content_file(banner)
 
-        if banner_verify == False:
+        if banner_ext == None:
             raise self.exception.exception_error(
                 "Tipo de arquivo inválido. Selecionar somente do tipo (.jpg, .jpeg, .png)",
                 status.HTTP_406_NOT_ACCEPTABLE
             )
 
-        banner_hash_name: str = Storage.generate_hash_filename(banner)
+        uploaded: Tuple[str, str] | None = await Storage.upload_file("products", banner, banner_ext)
+
+        if uploaded == None:
+            raise self.exception.exception_error(
+                "Arquivo excede o tamanho máximo permitido",
+                status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+
+        banner_hash_name, temp_path = uploaded
 
-        if product.banner != "":
-            Storage.delete_file(product.banner, "products")
+        try:
+            async with Storage.lock(banner_hash_name):
+                await Storage.commit_file(temp_path, banner_hash_name, "products")
 
-        await Storage.upload_file(banner_hash_name, "products", banner)
-        product: ProductResponseDTO = await self.upload_repository(id, banner_hash_name)
+                if not await Thumbnail.generate(Storage.file_path(banner_hash_name, "products")):
+                    await self._delete_unreferenced_banner(banner_hash_name)
+                    raise self.exception.exception_error(
+                        "Arquivo de imagem inválido",
+                        status.HTTP_406_NOT_ACCEPTABLE
+                    )
 
-        return product
+                product_updated: ProductResponseDTO = await self.upload_repository(id, banner_hash_name)
+        finally:
+            Storage.discard_file(temp_path)
+
+        http_cache.forget(f"product:{id}")
+
+        if product.banner != banner_hash_name:
+            await self._release_banner(product.banner)
+
+        return product_updated
+
+    async def _release_banner(self, banner: str) -> None:
+        if banner != "":
+            async with Storage.lock(banner):
+                await self._delete_unreferenced_banner(banner)
+
+    async def _delete_unreferenced_banner(self, banner: str) -> None:
+        if await self.count_by_banner_repository(banner) == 0:
+            Storage.delete_file(banner, "products")
     
     async def destroy_service(self, id: str) -> None:
         product_exists: ProductResponseDTO | None = await self.show_repository(id)
@@ -140,8 +457,224 @@ class ProductService(ProductRepository):
                 status.HTTP_404_NOT_FOUND
             )
         
-        if product_exists.banner != "":
-            Storage.delete_file(product_exists.banner, "products")
-
         await self.destroy_repository(id)
-        
\ No newline at end of file
+        http_cache.forget(f"product:{id}")
+        await self._release_banner(product_exists.banner)
+
+    async def store_many_service(
+        self,
+        productCreateRequestDTOs: List[ProductCreateRequestDTO]
+    ) -> BulkResponseDTO:
+        results: List[BulkItemResponseDTO | None] = [None] * len(productCreateRequestDTOs)
+        names: List[str] = list({item.name for item in productCreateRequestDTOs})
+        category_ids: List[str] = list({item.category_id for item in productCreateRequestDTOs})
+
+        existing_names: set = {
+            product.name for product in await self.show_many_by_name_repository(names)
+        }
+        existing_categories: set = {
+            category.id for category in await self.category_repository.show_many_repository(category_ids)
+        }
+
+        valid: List[int] = []
+        seen_names: set = set()
+
+        for index, item in enumerate(productCreateRequestDTOs):
+            if item.category_id not in existing_categories:
+                results[index] = BulkItemResponseDTO(
+                    index=index,
+                    status=status.HTTP_404_NOT_FOUND,
+                    detail="Categoria não encontrada"
+                )
+            elif item.name in existing_names or item.name in seen_names:
+                results[index] = BulkItemResponseDTO(
+                    index=index,
+                    status=status.HTTP_409_CONFLICT,
+                    detail="Nome do produto já existe"
+                )
+            else:
+                seen_names.add(item.name)
+                valid.append(index)
+
+        if valid != []:
+            try:
+                await self.store_many_repository([productCreateRequestDTOs[index] for index in valid])
+            except (UniqueViolationError, ForeignKeyViolationError):
+                for index in valid:
+                    results[index] = await self._store_item(index, productCreateRequestDTOs[index])
+
+                return self._bulk_response(results)
+
+            created: dict = {
+                product.name: product.id
+                for product in await self.show_many_by_name_repository(
+                    [productCreateRequestDTOs[index].name for index in valid]
+                )
+            }
+
+            for name, id in created.items():
+                self.name_index.add(id, name)
+
+            for index in valid:
+                results[index] = BulkItemResponseDTO(
+                    index=index,
+                    status=status.HTTP_201_CREATED,
+                    id=created.get(productCreateRequestDTOs[index].name)
+                )
+
+        return self._bulk_response(results)
+
+    async def _store_item(
+        self,
+        index: int,
+        productCreateRequestDTO: ProductCreateRequestDTO
+    ) -> BulkItemResponseDTO:
+        try:
+            product: ProductResponseDTO = await self.store_repository(productCreateRequestDTO)
+        except ForeignKeyViolationError:
+            return BulkItemResponseDTO(
+                index=index,
+                status=status.HTTP_404_NOT_FOUND,
+                detail="Categoria não encontrada"
+            )
+        except UniqueViolationError:
+            return BulkItemResponseDTO(
+                index=index,
+                status=status.HTTP_409_CONFLICT,
+                detail="Nome do produto já existe"
+            )
+
+        return BulkItemResponseDTO(
+            index=index,
+            status=status.HTTP_201_CREATED,
+            id=product.id
+        )
+
+    async def update_many_service(
+        self,
+        productBulkUpdateItemRequestDTOs: List[ProductBulkUpdateItemRequestDTO]
+    ) -> BulkResponseDTO:
+        results: List[BulkItemResponseDTO | None] = [None] * len(productBulkUpdateItemRequestDTOs)
+        ids: List[str] = list({item.id for item in productBulkUpdateItemRequestDTOs})
+        names: List[str] = list({item.name for item in productBulkUpdateItemRequestDTOs})
+
+        existing_ids: set = {product.id for product in await self.show_many_repository(ids)}
+        owners: dict = {
+            product.name: product.id for product in await self.show_many_by_name_repository(names)
+        }
+
+        valid: List[int] = []
+        seen_ids: set = set()
+        seen_names: set = set()
+
+        for index, item in enumerate(productBulkUpdateItemRequestDTOs):
+            if item.id not in existing_ids:
+                results[index] = BulkItemResponseDTO(
+                    index=index,
+                    status=status.HTTP_404_NOT_FOUND,
+                    id=item.id,
+                    detail="Produto não encontrado"
+                )
+            elif item.id in seen_ids:
+                results[index] = BulkItemResponseDTO(
+                    index=index,
+                    status=status.HTTP_409_CONFLICT,
+                    id=item.id,
+                    detail="Produto repetido na requisição"
+                )
+            elif owners.get(item.name, item.id) != item.id or item.name in seen_names:
+                results[index] = BulkItemResponseDTO(
+                    index=index,
+                    status=status.HTTP_409_CONFLICT,
+                    id=item.id,
+                    detail="Nome do produto já existe"
+                )
+            else:
+                seen_ids.add(item.id)
+                seen_names.add(item.name)
+                valid.append(index)
+
+        if valid != []:
+            try:
+                await self.update_many_repository(
+                    [productBulkUpdateItemRequestDTOs[index] for index in valid]
+                )
+            except UniqueViolationError:
+                raise self.exception.exception_error(
+                    "Nome do produto já existe. Nenhum produto do lote foi atualizado",
+                    status.HTTP_409_CONFLICT
+                )
+            except RecordNotFoundError:
+                raise self.exception.exception_error(
+                    "Produto não encontrado. Nenhum produto do lote foi atualizado",
+                    status.HTTP_404_NOT_FOUND
+                )
+
+            for index in valid:
+                id: str = productBulkUpdateItemRequestDTOs[index].id
+                http_cache.forget(f"product:{id}")
+                results[index] = BulkItemResponseDTO(
+                    index=index,
+                    status=status.HTTP_202_ACCEPTED,
+                    id=id
+                )
+
+        return self._bulk_response(results)
+
+    async def destroy_many_service(self, ids: List[str]) -> BulkResponseDTO:
+        products: dict = {
+            product.id: product for product in await self.show_many_repository(list(set(ids)))
+        }
+        deleted_ids: set = set()
+        results: List[BulkItemResponseDTO] = []
+
+        if products != {}:
+            deleted_ids = set(await self.destroy_many_repository(list(products.keys())))
+
+            if len(deleted_ids) != len(products):
+                logger.warning(
+                    "Remoção em lote: %d de %d produtos já tinham sido removidos por outra requisição",
+                    len(products) - len(deleted_ids),
+                    len(products)
+                )
+
+        seen_ids: set = set()
+
+        for index, id in enumerate(ids):
+            if id in seen_ids:
+                results.append(BulkItemResponseDTO(
+                    index=index,
+                    status=status.HTTP_409_CONFLICT,
+                    id=id,
+                    detail="Produto repetido na requisição"
+                ))
+            elif id in deleted_ids:
+                seen_ids.add(id)
+                http_cache.forget(f"product:{id}")
+                results.append(BulkItemResponseDTO(
+                    index=index,
+                    status=status.HTTP_204_NO_CONTENT,
+                    id=id
+                ))
+            else:
+                seen_ids.add(id)
+                results.append(BulkItemResponseDTO(
+                    index=index,
+                    status=status.HTTP_404_NOT_FOUND,
+                    id=id,
+                    detail="Produto não encontrado"
+                ))
+
+        for banner in {products[id].banner for id in deleted_ids}:
+            await self._release_banner(banner)
+
+        return self._bulk_response(results)
+
+    def _bulk_response(self, results: List[BulkItemResponseDTO]) -> BulkResponseDTO:
+        succeeded: int = len([result for result in results if result.status < 400])
+
+        return BulkResponseDTO(
+            items=results,
+            succeeded=succeeded,
+            failed=len(results) - succeeded
+        )
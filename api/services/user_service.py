@@ -13,7 +13,15 @@ from api.exceptions.http_exception import Exception
 
 from fastapi import status, UploadFile
 
+from prisma.errors import UniqueViolationError
+
+from core.current_user import user_cache
+
+from typing import Tuple
+
 from utils.storage import Storage
+from utils.http_cache import http_cache
+from utils.thumbnail import Thumbnail
 from utils.hash import Hash
 
 
@@ -27,25 +35,21 @@ class UserService(UserRepository):
         self, 
         userCreateRequestDTO: UserCreateRequestDTO
     ) -> UserResponseDTO:
-        email_exists: UserResponseDTO | None = await self.show_by_email_repository(
-            userCreateRequestDTO.email
+        hash_password: str = await self.hash.generate_hash_password(
+            userCreateRequestDTO.password
         )
 
-        if email_exists != None:
+        try:
+            user: UserResponseDTO = await self.signup_repository(
+                userCreateRequestDTO,
+                hash_password
+            )
+        except UniqueViolationError:
             raise self.exception.exception_error(
                 "E-mail já está cadastrado",
                 status.HTTP_409_CONFLICT
             )
 
-        hash_password: str = self.hash.generate_hash_password(
-            userCreateRequestDTO.password
-        )
-
-        user: UserResponseDTO = await self.signup_repository(
-            userCreateRequestDTO,
-            hash_password
-        )
-
         return user
     
     async def signin_service(
@@ -62,7 +66,7 @@ class UserService(UserRepository):
                 status.HTTP_400_BAD_REQUEST
             )
 
-        if not self.hash.verify_password(
+        if not await self.hash.verify_password(
             userLoginRequestDTO.password, 
             user.password
         ):
@@ -75,7 +79,8 @@ class UserService(UserRepository):
             id=user.id,
             name=user.name,
             email=user.email,
-            avatar=user.avatar
+            avatar=user.avatar,
+            updated_at=user.updated_at
         )
     
     async def update_service(
@@ -83,18 +88,19 @@ class UserService(UserRepository):
         id: str,
         userUpdateRequestDTO: UserUpdateRequestDTO
     ) -> UserResponseDTO:
-        user_exists: UserResponseDTO | None = await self.show_repository(id)
+        user: UserResponseDTO | None = await self.update_repository(
+            id, 
+            userUpdateRequestDTO
+        )
         
-        if user_exists == None:
+        if user == None:
             raise self.exception.exception_error(
                 "Usuário não encontrado",
                 status.HTTP_404_NOT_FOUND
             )
         
-        user: UserResponseDTO = await self.update_repository(
-            id, 
-            userUpdateRequestDTO
-        )
+        user_cache.delete(id)
+        http_cache.forget(f"user:{id}")
         
         return user
     
@@ -103,17 +109,18 @@ class UserService(UserRepository):
         id: str,
         userUpdatePassRequestDTO: UserUpdatePassRequestDTO
     ) -> UserResponseDTO:
-        user_exists: UserResponseDTO | None = await self.show_repository(id)
+        hash: str = await self.hash.generate_hash_password(userUpdatePassRequestDTO.password)
+
+        user: UserResponseDTO | None = await self.update_password_repository(id, hash)
         
-        if user_exists == None:
+        if user == None:
             raise self.exception.exception_error(
                 "Usuário não encontrado",
                 status.HTTP_404_NOT_FOUND
             )
         
-        hash: str = self.hash.generate_hash_password(userUpdatePassRequestDTO.password)
-
-        user: UserResponseDTO = await self.update_password_repository(id, hash)
+        user_cache.delete(id)
+        http_cache.forget(f"user:{id}")
         
         return user
 
@@ -122,24 +129,55 @@ class UserService(UserRepository):
         user_logged: UserResponseDTO, 
         avatar: UploadFile
     ) -> UserResponseDTO:
-        avatar_verify: bool = Storage.verify_ext_file(avatar)
+        avatar_ext: str | None = await Storage.verify_content_file(avatar)
 
-        if avatar_verify == False:
+        if avatar_ext == None:
             raise self.exception.exception_error(
                 "Tipo de arquivo inválido. Selecione somente arquivos do tipo (.jpg, .jpeg, .png)",
                 status.HTTP_406_NOT_ACCEPTABLE
             )
 
-        avatar_hash_name: str = Storage.generate_hash_filename(avatar)
+        uploaded: Tuple[str, str] | None = await Storage.upload_file("users", avatar, avatar_ext)
 
-        if user_logged.avatar != "":
-            Storage.delete_file(user_logged.avatar, "users")
+        if uploaded == None:
+            raise self.exception.exception_error(
+                "Arquivo excede o tamanho máximo permitido",
+                status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
 
-        await Storage.upload_file(avatar_hash_name, "users", avatar)
-        user: UserResponseDTO = await self.upload_repository(
-            user_logged.id, 
-            avatar_hash_name
-        )
+        avatar_hash_name, temp_path = uploaded
+
+        try:
+            async with Storage.lock(avatar_hash_name):
+                await Storage.commit_file(temp_path, avatar_hash_name, "users")
+
+                if not await Thumbnail.generate(Storage.file_path(avatar_hash_name, "users")):
+                    await self._delete_unreferenced_avatar(avatar_hash_name)
+                    raise self.exception.exception_error(
+                        "Arquivo de imagem inválido",
+                        status.HTTP_406_NOT_ACCEPTABLE
+                    )
+
+                user: UserResponseDTO = await self.upload_repository(
+                    user_logged.id, 
+                    avatar_hash_name
+                )
+        finally:
+            Storage.discard_file(temp_path)
+
+        user_cache.delete(user_logged.id)
+        http_cache.forget(f"user:{user_logged.id}")
+
+        if user_logged.avatar != avatar_hash_name:
+            await self._release_avatar(user_logged.avatar)
 
         return user
-    
\ No newline at end of file
+
+    async def _release_avatar(self, avatar: str) -> None:
+        if avatar != "":
+            async with Storage.lock(avatar):
+                await self._delete_unreferenced_avatar(avatar)
+
+    async def _delete_unreferenced_avatar(self, avatar: str) -> None:
+        if await self.count_by_avatar_repository(avatar) == 0:
+            Storage.delete_file(avatar, "users")
@@ -10,13 +10,41 @@ load_dotenv()
 
 class Settings(BaseConfig):
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    DATABASE_POOL_SIZE: int = int(os.getenv("DATABASE_POOL_SIZE", 10))
+    DATABASE_POOL_TIMEOUT: int = int(os.getenv("DATABASE_POOL_TIMEOUT", 10))
+    DATABASE_CONNECT_TIMEOUT: int = int(os.getenv("DATABASE_CONNECT_TIMEOUT", 10))
+    DATABASE_QUERY_TIMEOUT: int = int(os.getenv("DATABASE_QUERY_TIMEOUT", 30))
     API_VERSION: str = os.getenv("API_VERSION")
     REQUEST_PER_MINUTES: int = os.getenv("REQUEST_PER_MINUTES")
     REQUEST_PER_MINUTES_AUTH: int = os.getenv("REQUEST_PER_MINUTES_AUTH")
     UPLOAD_DIR: str = os.getenv("UPLOAD_DIR")
+    UPLOAD_MAX_SIZE: int = int(os.getenv("UPLOAD_MAX_SIZE", 5 * 1024 * 1024))
+    UPLOAD_CHUNK_SIZE: int = int(os.getenv("UPLOAD_CHUNK_SIZE", 64 * 1024))
+    THUMBNAIL_SMALL_SIZE: int = int(os.getenv("THUMBNAIL_SMALL_SIZE", 128))
+    THUMBNAIL_MEDIUM_SIZE: int = int(os.getenv("THUMBNAIL_MEDIUM_SIZE", 512))
+    THUMBNAIL_POOL_WORKERS: int = int(os.getenv("THUMBNAIL_POOL_WORKERS", 2))
     JWT_SECRET: str = os.getenv("JWT_SECRET")
     ALGORITHM: str = os.getenv("ALGORITHM")
+    FILE_URL_SECRET: str = os.getenv("FILE_URL_SECRET", os.getenv("JWT_SECRET"))
+    FILE_URL_TTL: int = int(os.getenv("FILE_URL_TTL", 3600))
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
+    USER_CACHE_MAXSIZE: int = int(os.getenv("USER_CACHE_MAXSIZE", 1024))
+    USER_CACHE_TTL: int = int(os.getenv("USER_CACHE_TTL", 60))
+    TOKEN_CACHE_MAXSIZE: int = int(os.getenv("TOKEN_CACHE_MAXSIZE", 4096))
+    TOKEN_CACHE_TTL: int = int(os.getenv("TOKEN_CACHE_TTL", 300))
+    BATCH_MAX_IDS: int = int(os.getenv("BATCH_MAX_IDS", 500))
+    BULK_MAX_ITEMS: int = int(os.getenv("BULK_MAX_ITEMS", 1000))
+    EXPORT_CHUNK_SIZE: int = int(os.getenv("EXPORT_CHUNK_SIZE", 1000))
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", 1000))
+    IMPORT_MAX_ERRORS: int = int(os.getenv("IMPORT_MAX_ERRORS", 1000))
+    SEARCH_COUNT_LIMIT: int = int(os.getenv("SEARCH_COUNT_LIMIT", 1000))
+    PREFIX_INDEX_CHUNK_SIZE: int = int(os.getenv("PREFIX_INDEX_CHUNK_SIZE", 5000))
+    CATALOG_CACHE_MAXSIZE: int = int(os.getenv("CATALOG_CACHE_MAXSIZE", 10000))
+    CATALOG_CACHE_TTL: int = int(os.getenv("CATALOG_CACHE_TTL", 300))
+    HTTP_CACHE_MAXSIZE: int = int(os.getenv("HTTP_CACHE_MAXSIZE", 10000))
+    HTTP_CACHE_TTL: int = int(os.getenv("HTTP_CACHE_TTL", 5))
+    HASH_POOL_EXECUTOR: str = os.getenv("HASH_POOL_EXECUTOR", "thread")
+    HASH_POOL_WORKERS: int = int(os.getenv("HASH_POOL_WORKERS", 4))
     
     class Config:
         case_sensitive = True
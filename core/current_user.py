@@ -1,3 +1,6 @@
+import hashlib
+import time
+
 from fastapi import Depends, status
 
 from api.dtos.responses.user_response_dto import UserResponseDTO
@@ -9,36 +12,70 @@ from jose import jwt, JWTError
 from core.config import settings
 
 from utils.auth_schema import oauth2_schema
+from utils.cache import TTLCache
+
+
+user_cache: TTLCache = TTLCache(
+    maxsize=settings.USER_CACHE_MAXSIZE,
+    ttl=settings.USER_CACHE_TTL
+)
+token_cache: TTLCache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAXSIZE,
+    ttl=settings.TOKEN_CACHE_TTL
+)
 
 
 class CurrentUser:
     def __init__(self) -> None:
         self.exception = Exception()
         self.user_repository = UserRepository()
+
+    def _decode_token(self, token: str) -> dict:
+        digest: str = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        payload: dict | None = token_cache.get(digest)
+
+        if payload != None:
+            return payload
+
+        payload = jwt.decode(
+            token,
+            settings.JWT_SECRET,
+            algorithms=[settings.ALGORITHM],
+            options={"verify_aud": False}
+        )
+
+        ttl: float = settings.TOKEN_CACHE_TTL
+        expire_at = payload.get("exp")
+
+        if isinstance(expire_at, (int, float)):
+            ttl = min(ttl, expire_at - time.time())
+
+        if ttl > 0:
+            token_cache.set(digest, payload, ttl)
+
+        return payload
     
     async def get_current_user(
         self,
         token: str = Depends(oauth2_schema)
     ) -> UserResponseDTO:
         try:
-            payload = jwt.decode(
-                token,
-                settings.JWT_SECRET,
-                algorithms=[settings.ALGORITHM],
-                options={"verify_aud": False}
-            )
+            payload: dict = self._decode_token(token)
 
             username: str = payload.get("sub")
 
             if username is None:
-                raise exception.exception_error_credential(
+                raise self.exception.exception_error_credential(
                     message="Token inválido ou expirado",
                     status=status.HTTP_401_UNAUTHORIZED
                 )
 
-            user: UserResponseDTO | None = await self.user_repository.show_repository(
-                username
-            )
+            user: UserResponseDTO | None = user_cache.get(username)
+
+            if user != None:
+                return user
+
+            user = await self.user_repository.show_repository(username)
 
             if user == None:
                 raise self.exception.exception_error_credential(
@@ -46,6 +83,8 @@ class CurrentUser:
                     status=status.HTTP_401_UNAUTHORIZED
                 )
 
+            user_cache.set(username, user)
+
             return user
         
         except JWTError:
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from prisma import Prisma
+
+from core.config import settings
+
+
+class Database:
+    def __init__(self) -> None:
+        self.prisma_db: Prisma = Prisma(
+            datasource={"url": self._datasource_url()},
+            connect_timeout=timedelta(seconds=settings.DATABASE_CONNECT_TIMEOUT),
+            http={"timeout": settings.DATABASE_QUERY_TIMEOUT}
+        )
+
+    def _datasource_url(self) -> str:
+        url = urlsplit(settings.DATABASE_URL)
+        query: dict = dict(parse_qsl(url.query))
+        query.setdefault("connection_limit", str(settings.DATABASE_POOL_SIZE))
+        query.setdefault("pool_timeout", str(settings.DATABASE_POOL_TIMEOUT))
+
+        return urlunsplit(url._replace(query=urlencode(query)))
+
+    async def connect(self) -> None:
+        if not self.prisma_db.is_connected():
+            await self.prisma_db.connect()
+
+    async def disconnect(self) -> None:
+        if self.prisma_db.is_connected():
+            await self.prisma_db.disconnect()
+
+    async def stats(self) -> dict:
+        stats: dict = {
+            "connected": self.prisma_db.is_connected(),
+            "pool_size": settings.DATABASE_POOL_SIZE,
+            "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+            "connect_timeout": settings.DATABASE_CONNECT_TIMEOUT,
+            "query_timeout": settings.DATABASE_QUERY_TIMEOUT,
+            "counters": {},
+            "gauges": {}
+        }
+
+        if stats["connected"]:
+            metrics = await self.prisma_db.get_metrics()
+            stats["counters"] = {counter.key: counter.value for counter in metrics.counters}
+            stats["gauges"] = {gauge.key: gauge.value for gauge in metrics.gauges}
+
+        return stats
+
+
+database: Database = Database()
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi_pagination import add_pagination
@@ -7,8 +9,12 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from api.routes import api_router
+from api.repositories.product_repository import ProductRepository
 
 from core.config import settings
+from core.database import database
+
+from utils.thumbnail import Thumbnail
 
 
 origins = [
@@ -18,6 +24,17 @@ origins = [
 
 limiter = Limiter(key_func=get_remote_address)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await database.connect()
+    await ProductRepository().load_name_index_repository()
+    Thumbnail.start()
+    yield
+    Thumbnail.shutdown()
+    await database.disconnect()
+
+
 app = FastAPI(
     title="Stock API",
     description="Aplicação para estoque de produtos por categoria",
@@ -32,7 +49,8 @@ app = FastAPI(
     license_info={
         "name": "Apache 2.0",
         "url": "https://www.apache.org/licenses/LICENSE-2.0.html",
-    }
+    },
+    lifespan=lifespan
 )
 
 app.state.limiter = limiter
@@ -0,0 +1,134 @@
+import time
+
+from abc import ABC, abstractmethod
+
+from collections import OrderedDict
+
+from typing import Any, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self.entries: OrderedDict = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self.entries.get(key)
+
+        if entry == None:
+            self.misses += 1
+            return None
+
+        value, expire_at = entry
+
+        if expire_at <= time.monotonic():
+            del self.entries[key]
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        if self.maxsize <= 0:
+            return
+
+        self.entries[key] = (value, time.monotonic() + (self.ttl if ttl == None else ttl))
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        lookups: int = self.hits + self.misses
+
+        return {
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, reservation: int | None = None) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def reserve(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> dict:
+        ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.reservations: Dict[str, Tuple[int, int]] = {}
+
+    async def get(self, key: str) -> Any | None:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: Any, reservation: int | None = None) -> None:
+        if reservation != None:
+            generation, _ = self.reservations.get(key, (None, 0))
+
+            if generation != reservation:
+                return
+
+        self.cache.set(key, value)
+
+    async def delete(self, key: str) -> None:
+        self.cache.delete(key)
+
+        if key in self.reservations:
+            generation, readers = self.reservations[key]
+            self.reservations[key] = (generation + 1, readers)
+
+    async def reserve(self, key: str) -> int:
+        generation, readers = self.reservations.get(key, (0, 0))
+        self.reservations[key] = (generation, readers + 1)
+
+        return generation
+
+    async def release(self, key: str) -> None:
+        generation, readers = self.reservations.get(key, (0, 1))
+
+        if readers <= 1:
+            self.reservations.pop(key, None)
+        else:
+            self.reservations[key] = (generation, readers - 1)
+
+    def stats(self) -> dict:
+        return self.cache.stats()
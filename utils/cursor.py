@@ -0,0 +1,23 @@
+import base64
+import binascii
+import json
+
+from datetime import datetime
+
+from typing import Tuple
+
+
+class Cursor:
+    def encode(created_at: datetime, id: str) -> str:
+        raw: bytes = json.dumps([created_at.isoformat(), id]).encode("utf-8")
+
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def decode(cursor: str) -> Tuple[datetime, str] | None:
+        try:
+            raw: bytes = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            created_at, id = json.loads(raw)
+
+            return datetime.fromisoformat(created_at), str(id)
+        except (binascii.Error, ValueError, TypeError):
+            return None
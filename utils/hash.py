@@ -1,16 +1,89 @@
+import asyncio
+import time
+
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+
+from typing import Any, Callable
+
 from passlib.context import CryptContext
 
+from core.config import settings
+
+
+crypto: CryptContext = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto"
+)
+
+
+def _verify_password(password: str, hash_password: str) -> bool:
+    return crypto.verify(password, hash_password)
+
+
+def _generate_hash_password(password: str) -> str:
+    return crypto.hash(password)
+
+
+class HashPool:
+    def __init__(self, executor: str, max_workers: int) -> None:
+        self.executor_type: str = executor
+        self.max_workers: int = max_workers
+        self.executor: Executor = (
+            ProcessPoolExecutor(max_workers=max_workers)
+            if executor == "process"
+            else ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hash")
+        )
+        self.semaphore: asyncio.Semaphore = asyncio.Semaphore(max_workers)
+        self.running: int = 0
+        self.waiting: int = 0
+        self.max_waiting: int = 0
+        self.completed: int = 0
+        self.wait_time: float = 0.0
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        queued_at: float = time.perf_counter()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.wait_time += time.perf_counter() - queued_at
+        self.running += 1
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self.semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.executor_type,
+            "max_workers": self.max_workers,
+            "running": self.running,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "completed": self.completed,
+            "average_wait": self.wait_time / self.completed if self.completed else 0.0
+        }
+
+
+hash_pool: HashPool = HashPool(
+    executor=settings.HASH_POOL_EXECUTOR,
+    max_workers=settings.HASH_POOL_WORKERS
+)
+
 
 class Hash:
     def __init__(self) -> None:
-        self.crypto: CryptContext = CryptContext(
-            schemes=["bcrypt"],
-            deprecated="auto"
-        )
+        self.crypto: CryptContext = crypto
     
-    def verify_password(self, password: str, hash_password: str) -> bool:
-        return self.crypto.verify(password, hash_password)
+    async def verify_password(self, password: str, hash_password: str) -> bool:
+        return await hash_pool.run(_verify_password, password, hash_password)
 
-    def generate_hash_password(self, password: str) -> str:
-        return self.crypto.hash(password)
-    
\ No newline at end of file
+    async def generate_hash_password(self, password: str) -> str:
+        return await hash_pool.run(_generate_hash_password, password)
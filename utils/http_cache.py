@@ -0,0 +1,96 @@
+import re
+
+from fastapi import Request, Response, status
+
+from datetime import datetime, timezone
+
+from email.utils import format_datetime, parsedate_to_datetime
+
+from typing import Tuple
+
+from core.config import settings
+
+from utils.cache import TTLCache
+from utils.signed_url import SignedUrl
+
+
+ENTITY_TAG = re.compile(r'\*|(?:W/)?("[^"]*")')
+
+
+class HttpCache:
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.stamps: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def stamp(self, key: str) -> Tuple[str, datetime] | None:
+        return self.stamps.get(key)
+
+    def remember(
+        self,
+        key: str,
+        updated_at: datetime | None,
+        variant: str = ""
+    ) -> Tuple[str, datetime]:
+        window: int = SignedUrl.window()
+        window_start: datetime = datetime.fromtimestamp(window * settings.FILE_URL_TTL, tz=timezone.utc)
+        last_modified: datetime = max(
+            (updated_at or datetime.now(tz=timezone.utc)).astimezone(timezone.utc),
+            window_start
+        )
+        etag: str = f'W/"{key}:{int(last_modified.timestamp() * 1000)}:{window}{variant}"'
+        stamp: Tuple[str, datetime] = (etag, last_modified)
+
+        if updated_at != None and variant == "":
+            self.stamps.set(key, stamp)
+
+        return stamp
+
+    def forget(self, key: str) -> None:
+        self.stamps.delete(key)
+
+    def is_not_modified(self, request: Request, stamp: Tuple[str, datetime]) -> bool:
+        etag, last_modified = stamp
+        if_none_match: str | None = request.headers.get("if-none-match")
+
+        if if_none_match != None:
+            opaque_tag: str = etag.removeprefix("W/")
+
+            return any(
+                match.group(0) == "*" or match.group(1) == opaque_tag
+                for match in ENTITY_TAG.finditer(if_none_match)
+            )
+
+        if_modified_since: str | None = request.headers.get("if-modified-since")
+
+        if if_modified_since != None:
+            try:
+                since: datetime = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+
+            if since.tzinfo == None:
+                since = since.replace(tzinfo=timezone.utc)
+
+            return last_modified.replace(microsecond=0) <= since
+
+        return False
+
+    def headers(self, stamp: Tuple[str, datetime]) -> dict:
+        etag, last_modified = stamp
+
+        return {
+            "ETag": etag,
+            "Last-Modified": format_datetime(last_modified, usegmt=True),
+            "Cache-Control": "private, no-cache"
+        }
+
+    def not_modified_response(self, stamp: Tuple[str, datetime]) -> Response:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=self.headers(stamp)
+        )
+
+
+http_cache: HttpCache = HttpCache(
+    maxsize=settings.HTTP_CACHE_MAXSIZE,
+    ttl=settings.HTTP_CACHE_TTL
+)
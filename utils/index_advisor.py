@@ -0,0 +1,422 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import tempfile
+import uuid
+
+import psycopg2
+import psycopg2.extras
+
+from prisma import Prisma
+
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Tuple
+
+from core.config import settings
+
+from api.dtos.requests.category_request_dto import CategoryUpdateRequestDTO
+from api.dtos.requests.list_request_dto import ListFilterRequestDTO, ListSort
+from api.dtos.requests.product_request_dto import (
+    ProductUpdateRequestDTO,
+    ProductBulkUpdateItemRequestDTO,
+    ProductListFilterRequestDTO
+)
+from api.dtos.requests.user_request_dto import UserUpdateRequestDTO
+from api.repositories.category_repository import CategoryRepository
+from api.repositories.product_repository import ProductRepository
+from api.repositories.user_repository import UserRepository
+
+from utils.cache import MemoryCacheBackend
+from utils.prefix_index import PrefixIndex
+
+
+LIBPQ_PARAMS: set = {"sslmode", "sslrootcert", "sslcert", "sslkey", "connect_timeout", "application_name"}
+
+EXPLAINABLE = re.compile(r"^\s*(WITH|SELECT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+ANALYZABLE = re.compile(r"^\s*(WITH|SELECT)\b", re.IGNORECASE)
+
+
+def _products(db: Prisma) -> ProductRepository:
+    return ProductRepository(db, MemoryCacheBackend(maxsize=0, ttl=0), PrefixIndex())
+
+
+def _categories(db: Prisma) -> CategoryRepository:
+    return CategoryRepository(db, MemoryCacheBackend(maxsize=0, ttl=0))
+
+
+def _users(db: Prisma) -> UserRepository:
+    return UserRepository(db)
+
+
+RepositoryCall = Tuple[str, bool, Callable[[Prisma, dict], Awaitable[Any]]]
+
+REPOSITORY_CALLS: List[RepositoryCall] = [
+    ("product.show", False, lambda db, s: _products(db).show_repository(s["product"]["id"])),
+    ("product.show_with_category", False, lambda db, s: _products(db).show_with_category_repository(s["product"]["id"])),
+    ("product.show_many", False, lambda db, s: _products(db).show_many_repository([s["product"]["id"], str(uuid.uuid4())])),
+    ("product.show_many_by_name", False, lambda db, s: _products(db).show_many_by_name_repository([s["product"]["name"]])),
+    ("product.index", False, lambda db, s: _products(db).index_repository(1, 50)),
+    ("product.index_include_category", False, lambda db, s: _products(db).index_repository(
+        1, 50, ProductListFilterRequestDTO(), True
+    )),
+    ("product.index_sort_name", False, lambda db, s: _products(db).index_repository(
+        1, 50, ProductListFilterRequestDTO(sort=ListSort.name)
+    )),
+    ("product.index_sort_update", False, lambda db, s: _products(db).index_repository(
+        1, 50, ProductListFilterRequestDTO(sort=ListSort.update_at_desc)
+    )),
+    ("product.index_name_contains", False, lambda db, s: _products(db).index_repository(
+        1, 50, ProductListFilterRequestDTO(name=s["product"]["name"][-6:])
+    )),
+    ("product.index_created_range", False, lambda db, s: _products(db).index_repository(
+        1, 50, ProductListFilterRequestDTO(created_from=s["product"]["createdAt"], created_to=s["product"]["createdAt"])
+    )),
+    ("product.index_has_banner", False, lambda db, s: _products(db).index_repository(
+        1, 50, ProductListFilterRequestDTO(has_banner=True)
+    )),
+    ("product.index_without_banner", False, lambda db, s: _products(db).index_repository(
+        1, 50, ProductListFilterRequestDTO(has_banner=False)
+    )),
+    ("product.index_by_category", False, lambda db, s: _products(db).index_by_category_repository(
+        s["product"]["categoryId"], 1, 50
+    )),
+    ("product.index_cursor", False, lambda db, s: _products(db).index_cursor_repository(
+        (s["product"]["createdAt"], s["product"]["id"]), 50
+    )),
+    ("product.index_by_category_cursor", False, lambda db, s: _products(db).index_cursor_repository(
+        (s["product"]["createdAt"], s["product"]["id"]), 50, s["product"]["categoryId"]
+    )),
+    ("product.export_chunk", False, lambda db, s: _products(db).index_cursor_repository(
+        (s["product"]["createdAt"], s["product"]["id"]), settings.EXPORT_CHUNK_SIZE
+    )),
+    ("product.search", False, lambda db, s: _products(db).search_repository(s["product"]["name"][:8], 1, 50)),
+    ("product.exists_by_category", False, lambda db, s: _products(db).exists_by_category_repository(
+        s["product"]["categoryId"]
+    )),
+    ("product.count_by_banner", False, lambda db, s: _products(db).count_by_banner_repository(
+        s["product"]["banner"] or "advisor.png"
+    )),
+    ("product.load_name_index", False, lambda db, s: _products(db).load_name_index_repository()),
+    ("product.update", True, lambda db, s: _products(db).update_repository(
+        s["product"]["id"],
+        ProductUpdateRequestDTO(name=s["product"]["name"], description="advisor")
+    )),
+    ("product.update_many", True, lambda db, s: _products(db).update_many_repository([
+        ProductBulkUpdateItemRequestDTO(id=s["product"]["id"], name=s["product"]["name"], description="advisor")
+    ])),
+    ("product.upload", True, lambda db, s: _products(db).upload_repository(s["product"]["id"], "advisor.png")),
+    ("product.destroy", True, lambda db, s: _products(db).destroy_repository(s["product"]["id"])),
+    ("product.destroy_many", True, lambda db, s: _products(db).destroy_many_repository([s["product"]["id"]])),
+    ("category.show", False, lambda db, s: _categories(db).show_repository(s["category"]["id"])),
+    ("category.show_many", False, lambda db, s: _categories(db).show_many_repository([s["category"]["id"]])),
+    ("category.show_many_by_name", False, lambda db, s: _categories(db).show_many_by_name_repository(
+        [s["category"]["name"]]
+    )),
+    ("category.index", False, lambda db, s: _categories(db).index_repository(s["category"]["userId"], 1, 50)),
+    ("category.index_sort_name", False, lambda db, s: _categories(db).index_repository(
+        s["category"]["userId"], 1, 50, ListFilterRequestDTO(sort=ListSort.name)
+    )),
+    ("category.index_sort_update", False, lambda db, s: _categories(db).index_repository(
+        s["category"]["userId"], 1, 50, ListFilterRequestDTO(sort=ListSort.update_at_desc)
+    )),
+    ("category.index_name_contains", False, lambda db, s: _categories(db).index_repository(
+        s["category"]["userId"], 1, 50, ListFilterRequestDTO(name=s["category"]["name"][-6:])
+    )),
+    ("category.index_cursor", False, lambda db, s: _categories(db).index_cursor_repository(
+        s["category"]["userId"], (s["category"]["createdAt"], s["category"]["id"]), 50
+    )),
+    ("category.update", True, lambda db, s: _categories(db).update_repository(
+        s["category"]["id"],
+        CategoryUpdateRequestDTO(name=s["category"]["name"])
+    )),
+    ("category.destroy", True, lambda db, s: _categories(db).destroy_repository(s["category"]["id"])),
+    ("user.show", False, lambda db, s: _users(db).show_repository(s["user"]["id"])),
+    ("user.show_by_email", False, lambda db, s: _users(db).show_by_email_repository(s["user"]["email"])),
+    ("user.count_by_avatar", False, lambda db, s: _users(db).count_by_avatar_repository(
+        s["user"]["avatar"] or "advisor.png"
+    )),
+    ("user.update", True, lambda db, s: _users(db).update_repository(
+        s["user"]["id"],
+        UserUpdateRequestDTO(name=s["user"]["name"])
+    )),
+    ("user.update_password", True, lambda db, s: _users(db).update_password_repository(s["user"]["id"], "advisor")),
+    ("user.upload", True, lambda db, s: _users(db).upload_repository(s["user"]["id"], "advisor.png"))
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class IndexAdvisor:
+    def __init__(self, threshold: int, analyze: bool = False) -> None:
+        self.threshold = threshold
+        self.analyze = analyze
+        self.connection = psycopg2.connect(self._dsn())
+        self.connection.autocommit = True
+
+    def _dsn(self) -> str:
+        url = urlsplit(settings.DATABASE_URL)
+        query: dict = {
+            key: value for key, value in parse_qsl(url.query) if key in LIBPQ_PARAMS
+        }
+
+        return urlunsplit(url._replace(query=urlencode(query)))
+
+    def seed(self, products: int, categories: int) -> None:
+        suffix: str = uuid.uuid4().hex[:8]
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                '''INSERT INTO "users" ("id", "name", "email", "password", "createdAt", "updateAt")
+                VALUES (%s, %s, %s, '', now(), now())''',
+                (str(uuid.uuid4()), "index advisor", f"advisor-{suffix}@example.com")
+            )
+            cursor.execute('SELECT "id" FROM "users" WHERE "email" = %s', (f"advisor-{suffix}@example.com",))
+            user_id: str = cursor.fetchone()[0]
+
+            cursor.execute(
+                '''INSERT INTO "categories" ("id", "name", "userId", "createdAt", "updateAt")
+                SELECT gen_random_uuid()::text, 'advisor-category-' || %s || '-' || g, %s,
+                    now() - g * interval '1 minute', now()
+                FROM generate_series(1, %s) g''',
+                (suffix, user_id, categories)
+            )
+            cursor.execute(
+                '''INSERT INTO "products"
+                    ("id", "name", "description", "banner", "categoryId", "createdAt", "updateAt")
+                SELECT gen_random_uuid()::text, 'advisor-product-' || %s || '-' || g, md5(g::text),
+                    CASE WHEN g %% 2 = 0 THEN '' ELSE md5(g::text) || '.png' END,
+                    ids[1 + g %% array_length(ids, 1)],
+                    now() - g * interval '1 second', now() - g * interval '1 second'
+                FROM generate_series(1, %s) g,
+                    (SELECT array_agg("id") AS ids FROM "categories" WHERE "userId" = %s) c''',
+                (suffix, products, user_id)
+            )
+            cursor.execute('ANALYZE "users", "categories", "products"')
+
+    def _samples(self) -> Dict[str, dict] | None:
+        samples: Dict[str, dict] = {}
+
+        with self.connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            for name, table in (("user", "users"), ("category", "categories"), ("product", "products")):
+                cursor.execute(f'SELECT * FROM "{table}" ORDER BY "createdAt" DESC LIMIT 1')
+                row = cursor.fetchone()
+
+                if row == None:
+                    return None
+
+                samples[name] = dict(row)
+
+        return samples
+
+    def _table_rows(self) -> Dict[str, int]:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                '''SELECT "relname", "reltuples"::bigint FROM "pg_class"
+                WHERE "relname" IN ('users', 'categories', 'products') AND "relkind" = 'r' '''
+            )
+
+            return {relname: reltuples for relname, reltuples in cursor.fetchall()}
+
+    def _seq_scans(self, plan: dict) -> Iterator[str]:
+        if plan.get("Node Type") == "Seq Scan":
+            yield plan["Relation Name"]
+
+        for child in plan.get("Plans", []):
+            yield from self._seq_scans(child)
+
+    def _removed_rows(self, plan: dict) -> Iterator[Tuple[str, int]]:
+        removed: int = int(plan.get("Rows Removed by Filter", 0)) * int(plan.get("Actual Loops", 1))
+
+        if removed > 0:
+            yield f'{plan.get("Node Type")} {plan.get("Index Name") or plan.get("Relation Name") or ""}'.strip(), removed
+
+        for child in plan.get("Plans", []):
+            yield from self._removed_rows(child)
+
+    async def capture(
+        self,
+        samples: Dict[str, dict]
+    ) -> Tuple[List[Tuple[str, str, Any]], List[Tuple[str, str]]]:
+        log_fd, log_path = tempfile.mkstemp(suffix=".log")
+        os.close(log_fd)
+        log_fd = os.open(log_path, os.O_WRONLY | os.O_APPEND)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved: Dict[int, int] = {fd: os.dup(fd) for fd in (1, 2)}
+        queries: List[Tuple[str, str, Any]] = []
+        failures: List[Tuple[str, str]] = []
+
+        for fd in saved:
+            os.dup2(log_fd, fd)
+
+        try:
+            with open(log_path) as log:
+                client: Prisma = Prisma(datasource={"url": settings.DATABASE_URL}, log_queries=True)
+                await client.connect()
+
+                try:
+                    log.read()
+
+                    for name, write, call in REPOSITORY_CALLS:
+                        try:
+                            if write:
+                                async with client.tx() as transaction:
+                                    await call(transaction, samples)
+                                    raise _Rollback()
+                            else:
+                                await call(client, samples)
+                        except _Rollback:
+                            pass
+                        except Exception as e:
+                            failures.append((name, str(e)))
+
+                        await asyncio.sleep(0.05)
+                        seen: set = set()
+
+                        for sql, params in self._parse_log(log.read()):
+                            if sql not in seen:
+                                seen.add(sql)
+                                queries.append((name, sql, params))
+                finally:
+                    await client.disconnect()
+        finally:
+            for fd, saved_fd in saved.items():
+                os.dup2(saved_fd, fd)
+                os.close(saved_fd)
+
+            os.close(log_fd)
+            os.remove(log_path)
+
+        return queries, failures
+
+    def _parse_log(self, text: str) -> Iterator[Tuple[str, Any]]:
+        for line in text.splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+
+            fields: dict = entry.get("fields", {}) if isinstance(entry, dict) else {}
+            sql: str = str(fields.get("query") or fields.get("message") or "")
+
+            if EXPLAINABLE.match(sql) != None:
+                yield sql.strip(), fields.get("params")
+
+    def _explain(self, cursor, sql: str, params: Any, analyze: bool = False) -> dict:
+        values: Any = params
+
+        if isinstance(values, str):
+            try:
+                values = json.loads(values)
+            except ValueError:
+                values = None
+
+        if not isinstance(values, list):
+            cursor.execute("EXPLAIN (GENERIC_PLAN, FORMAT JSON) " + sql)
+        else:
+            options: str = "ANALYZE, FORMAT JSON" if analyze and ANALYZABLE.match(sql) != None else "FORMAT JSON"
+            cursor.execute(
+                f"EXPLAIN ({options}) " + re.sub(
+                    r"\$(\d+)",
+                    lambda match: f"%(p{match.group(1)})s",
+                    sql.replace("%", "%%")
+                ),
+                {
+                    f"p{index}": json.dumps(value) if isinstance(value, (dict, list)) else value
+                    for index, value in enumerate(values, start=1)
+                }
+            )
+
+        return cursor.fetchone()[0][0]["Plan"]
+
+    def check(self) -> int:
+        samples: Dict[str, dict] | None = self._samples()
+
+        if samples == None:
+            print("Banco de dados vazio. Execute novamente com --seed para gerar dados de teste.")
+            return 2
+
+        queries, failures = asyncio.run(self.capture(samples))
+
+        for name, error in failures:
+            print(f"ERRO      {name}: {error}")
+
+        if queries == []:
+            print("Nenhuma consulta capturada. Verifique se o log de consultas do Prisma está disponível.")
+            return 2
+
+        table_rows: Dict[str, int] = self._table_rows()
+        flagged: int = 0
+
+        with self.connection.cursor() as cursor:
+            for name, sql, params in queries:
+                try:
+                    plan: dict = self._explain(cursor, sql, params, self.analyze)
+                except psycopg2.Error as e:
+                    print(f"ERRO      {name}: {str(e).strip()}\n          {sql}")
+                    continue
+
+                scans: List[str] = [
+                    table for table in self._seq_scans(plan)
+                    if table_rows.get(table, 0) > self.threshold
+                ]
+                filtered: List[Tuple[str, int]] = [
+                    (node, removed) for node, removed in self._removed_rows(plan)
+                    if removed > self.threshold
+                ]
+
+                if scans != []:
+                    flagged += 1
+                    print(f"SEQ SCAN  {name}: " + ", ".join(
+                        f"{table} (~{table_rows[table]} linhas)" for table in scans
+                    ) + f"\n          {sql}")
+                elif filtered != []:
+                    flagged += 1
+                    print(f"FILTRO    {name}: " + ", ".join(
+                        f"{node} ({removed} linhas descartadas)" for node, removed in filtered
+                    ) + f"\n          {sql}")
+                else:
+                    print(f"OK        {name}")
+
+        print(f"{len(queries)} consultas analisadas, {flagged} com seq scan ou filtro acima de {self.threshold} linhas")
+
+        return 1 if flagged > 0 else 0
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Executa os métodos dos repositórios com o log de consultas do Prisma, roda EXPLAIN no SQL capturado e aponta seq scans em tabelas grandes"
+    )
+    parser.add_argument("--threshold", type=int, default=10000, help="linhas a partir das quais um seq scan é apontado")
+    parser.add_argument("--seed", type=int, default=0, help="quantidade de produtos de teste a inserir antes da análise")
+    parser.add_argument(
+        "--analyze",
+        action="store_true",
+        help="executa EXPLAIN ANALYZE nos SELECTs e aponta nós que descartam mais linhas que o limite"
+    )
+    parser.add_argument("--categories", type=int, default=100, help="quantidade de categorias de teste a inserir com --seed")
+    args = parser.parse_args()
+
+    advisor: IndexAdvisor = IndexAdvisor(args.threshold, args.analyze)
+
+    try:
+        if args.seed > 0:
+            advisor.seed(args.seed, args.categories)
+
+        return advisor.check()
+    finally:
+        advisor.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
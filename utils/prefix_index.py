@@ -0,0 +1,85 @@
+import sys
+import time
+
+from bisect import bisect_left
+
+from typing import Dict, Iterable, List, Tuple
+
+
+class PrefixIndex:
+    def __init__(self) -> None:
+        self.entries: List[Tuple[str, str]] = []
+        self.names: Dict[str, str] = {}
+        self.entries_bytes: int = 0
+        self.build_seconds: float = 0.0
+        self.ready: bool = False
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        return value.casefold()
+
+    def _entry(self, id: str, name: str) -> Tuple[str, str]:
+        return (self.normalize(name), id)
+
+    def _entry_bytes(self, entry: Tuple[str, str], name: str) -> int:
+        key, id = entry
+
+        return sys.getsizeof(entry) + sys.getsizeof(key) + sys.getsizeof(id) + sys.getsizeof(name)
+
+    def build(self, items: Iterable[Tuple[str, str]], started: float | None = None) -> None:
+        started = started if started != None else time.perf_counter()
+        names: Dict[str, str] = dict(items)
+        entries: List[Tuple[str, str]] = sorted(self._entry(id, name) for id, name in names.items())
+
+        self.entries = entries
+        self.names = names
+        self.entries_bytes = sum(
+            self._entry_bytes(entry, names[entry[1]]) for entry in entries
+        )
+        self.build_seconds = time.perf_counter() - started
+        self.ready = True
+
+    def add(self, id: str, name: str) -> None:
+        self.remove(id)
+
+        entry: Tuple[str, str] = self._entry(id, name)
+        self.entries.insert(bisect_left(self.entries, entry), entry)
+        self.names[id] = name
+        self.entries_bytes += self._entry_bytes(entry, name)
+
+    def remove(self, id: str) -> None:
+        name: str | None = self.names.pop(id, None)
+
+        if name == None:
+            return
+
+        entry: Tuple[str, str] = self._entry(id, name)
+        index: int = bisect_left(self.entries, entry)
+
+        if index < len(self.entries) and self.entries[index] == entry:
+            del self.entries[index]
+            self.entries_bytes -= self._entry_bytes(entry, name)
+
+    def search(self, prefix: str, limit: int) -> List[str]:
+        key: str = self.normalize(prefix)
+        index: int = bisect_left(self.entries, (key, ""))
+        matches: List[str] = []
+
+        while index < len(self.entries) and len(matches) < limit:
+            entry_key, id = self.entries[index]
+
+            if not entry_key.startswith(key):
+                break
+
+            matches.append(self.names[id])
+            index += 1
+
+        return matches
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "size": len(self.entries),
+            "memory_bytes": sys.getsizeof(self.entries) + sys.getsizeof(self.names) + self.entries_bytes,
+            "build_seconds": self.build_seconds
+        }
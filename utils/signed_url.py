@@ -0,0 +1,40 @@
+import hashlib
+import hmac
+import time
+
+from core.config import settings
+
+
+class SignedUrl:
+    def window() -> int:
+        return int(time.time()) // settings.FILE_URL_TTL
+
+    def signature(path: str, filename: str, expires: int) -> str:
+        message: bytes = f"{path}/{filename}:{expires}".encode("utf-8")
+
+        return hmac.new(
+            settings.FILE_URL_SECRET.encode("utf-8"),
+            message,
+            hashlib.sha256
+        ).hexdigest()
+
+    def generate(path: str, filename: str) -> str | None:
+        if not filename:
+            return None
+
+        expires: int = (SignedUrl.window() + 2) * settings.FILE_URL_TTL
+        signature: str = SignedUrl.signature(path, filename, expires)
+
+        return (
+            f"/api/{settings.API_VERSION}/files/{path}/{filename}"
+            f"?expires={expires}&signature={signature}"
+        )
+
+    def verify(path: str, filename: str, expires: int, signature: str) -> bool:
+        if expires < time.time():
+            return False
+
+        return hmac.compare_digest(
+            SignedUrl.signature(path, filename, expires),
+            signature
+        )
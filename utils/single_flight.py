@@ -0,0 +1,59 @@
+import asyncio
+
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _LeaderCancelled(Exception):
+    pass
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self.calls: Dict[Hashable, asyncio.Future] = {}
+        self.executed: int = 0
+        self.shared: int = 0
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        while True:
+            future: asyncio.Future | None = self.calls.get(key)
+
+            if future == None:
+                return await self._lead(key, func, *args)
+
+            self.shared += 1
+
+            try:
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                continue
+
+    async def _lead(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.calls[key] = future
+        self.executed += 1
+
+        try:
+            result = await func(*args)
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self.calls[key]
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self.calls),
+            "executed": self.executed,
+            "shared": self.shared
+        }
+
+
+single_flight: SingleFlight = SingleFlight()
@@ -1,4 +1,7 @@
+import asyncio
+import hashlib
 import os
+import re
 
 from fastapi import UploadFile
 
@@ -6,32 +9,105 @@ from aiofile import async_open
 
 from uuid import uuid4
 
+from typing import Tuple
+
+from weakref import WeakValueDictionary
+
 from core.config import settings
 
+from utils.thumbnail import ImageSize, Thumbnail
+
+
+_locks: WeakValueDictionary = WeakValueDictionary()
+
 
 class Storage:
-    def verify_ext_file(file: UploadFile) -> bool:
-        ext_file: str = file.filename.split('.')[-1]
+    def lock(filename: str) -> asyncio.Lock:
+        lock: asyncio.Lock | None = _locks.get(filename)
+
+        if lock == None:
+            lock = asyncio.Lock()
+            _locks[filename] = lock
+
+        return lock
+
+    async def verify_content_file(file: UploadFile) -> str | None:
+        header: bytes = await file.read(8)
+        await file.seek(0)
+
+        if header.startswith(b"\x89PNG\r\n\x1a\n"):
+            return "png"
+
+        if header.startswith(b"\xff\xd8\xff"):
+            return "jpg"
+
+        return None
+
+    def directory(filename: str, path: str) -> str:
+        digest: str = os.path.splitext(filename)[0]
 
-        if ext_file != "png" and ext_file != "jpeg" and ext_file != "jpg":
-            return False
+        if re.fullmatch(r"[0-9a-f]{64}", digest) == None:
+            return f"./{settings.UPLOAD_DIR}/{path}"
 
-        return True
+        return f"./{settings.UPLOAD_DIR}/{path}/{digest[:2]}/{digest[2:4]}"
 
-    def generate_hash_filename(file: UploadFile) -> str:
-        ext_file: str = file.filename.split('.')[-1]
-        filename: str = f"{str(uuid4())}.{ext_file}"
+    async def upload_file(path: str, file: UploadFile, ext_file: str) -> Tuple[str, str] | None:
+        if file.size != None and file.size > settings.UPLOAD_MAX_SIZE:
+            return None
 
-        return filename
+        root: str = f"./{settings.UPLOAD_DIR}/{path}"
+        temp_path: str = f"{root}/.{uuid4().hex}.tmp"
+        digest = hashlib.sha256()
+        size: int = 0
 
-    async def upload_file(filename: str, path: str, file: UploadFile) -> None:
-        if not os.path.exists(f"./{settings.UPLOAD_DIR}/{path}"):
-            os.makedirs(f"./{settings.UPLOAD_DIR}/{path}")
+        await asyncio.to_thread(os.makedirs, root, exist_ok=True)
 
-        async with async_open(f"./{settings.UPLOAD_DIR}/{path}/{filename}", "wb") as afile:
-            await afile.write(file.file.read())
+        try:
+            async with async_open(temp_path, "wb") as afile:
+                while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+                    size += len(chunk)
+
+                    if size > settings.UPLOAD_MAX_SIZE:
+                        break
+
+                    digest.update(chunk)
+                    await afile.write(chunk)
+        except BaseException:
+            Storage.discard_file(temp_path)
+            raise
+
+        if size > settings.UPLOAD_MAX_SIZE:
+            Storage.discard_file(temp_path)
+            return None
+
+        return f"{digest.hexdigest()}.{ext_file}", temp_path
+
+    async def commit_file(temp_path: str, filename: str, path: str) -> None:
+        directory: str = Storage.directory(filename, path)
+
+        await asyncio.to_thread(os.makedirs, directory, exist_ok=True)
+
+        if os.path.isfile(f"{directory}/{filename}"):
+            await asyncio.to_thread(os.remove, temp_path)
+        else:
+            await asyncio.to_thread(os.replace, temp_path, f"{directory}/{filename}")
+
+    def discard_file(temp_path: str) -> None:
+        if os.path.isfile(temp_path):
+            os.remove(temp_path)
+
+    def file_path(filename: str, path: str, size: ImageSize = ImageSize.original) -> str:
+        directory: str = Storage.directory(filename, path)
+        variant_path: str = f"{directory}/{Thumbnail.variant_filename(filename, size)}"
+
+        if size != ImageSize.original and not os.path.isfile(variant_path):
+            return f"{directory}/{filename}"
+
+        return variant_path
 
     def delete_file(file_path: str, path: str) -> None:
-        if os.path.isfile(f"./{settings.UPLOAD_DIR}/{path}/{file_path}"):
-            os.remove(f"./{settings.UPLOAD_DIR}/{path}/{file_path}")
-            
\ No newline at end of file
+        for size in ImageSize:
+            variant_path: str = Storage.file_path(file_path, path, size)
+
+            if os.path.isfile(variant_path):
+                os.remove(variant_path)
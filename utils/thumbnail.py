@@ -0,0 +1,104 @@
+import asyncio
+import multiprocessing
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from enum import Enum
+
+from uuid import uuid4
+
+from PIL import Image, ImageOps
+
+from core.config import settings
+
+
+class ImageSize(str, Enum):
+    small = "small"
+    medium = "medium"
+    original = "original"
+
+
+SIZES: dict = {
+    ImageSize.small: settings.THUMBNAIL_SMALL_SIZE,
+    ImageSize.medium: settings.THUMBNAIL_MEDIUM_SIZE
+}
+
+
+
+def _resize(source: str, target: str, size: int) -> None:
+    if os.path.isfile(target):
+        return
+
+    temp_path: str = f"{target}.{uuid4().hex}.tmp"
+
+    try:
+        with Image.open(source) as image:
+            image_format: str = image.format
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((size, size))
+            image.save(temp_path, format=image_format)
+
+        os.replace(temp_path, target)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+
+        raise
+
+
+class Thumbnail:
+    pool: ProcessPoolExecutor | None = None
+
+    def start() -> ProcessPoolExecutor:
+        if Thumbnail.pool == None:
+            Thumbnail.pool = ProcessPoolExecutor(
+                max_workers=settings.THUMBNAIL_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+
+        return Thumbnail.pool
+
+    def shutdown() -> None:
+        pool: ProcessPoolExecutor | None = Thumbnail.pool
+        Thumbnail.pool = None
+
+        if pool != None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def variant_filename(filename: str, size: ImageSize) -> str:
+        if size == ImageSize.original:
+            return filename
+
+        stem, ext_file = os.path.splitext(filename)
+
+        return f"{stem}_{size.value}{ext_file}"
+
+    async def generate(file_path: str) -> bool:
+        loop = asyncio.get_running_loop()
+        pool: ProcessPoolExecutor = Thumbnail.start()
+
+        try:
+            await asyncio.gather(*[
+                loop.run_in_executor(
+                    pool,
+                    _resize,
+                    file_path,
+                    Thumbnail.variant_filename(file_path, size),
+                    dimension
+                )
+                for size, dimension in SIZES.items()
+            ])
+        except BrokenProcessPool:
+            if Thumbnail.pool is pool:
+                Thumbnail.pool = None
+                pool.shutdown(wait=False, cancel_futures=True)
+
+            return False
+        except (OSError, ValueError, Image.DecompressionBombError):
+            return False
+
+        return True